@@ -0,0 +1,7 @@
+"""
+Excel Agent core package.
+
+Import from the submodules directly (excel_agent.core.excel_agent_core,
+excel_agent.core.references, ...). Nothing is imported here so that the
+light modules stay usable without loading openpyxl.
+"""
@@ -0,0 +1,49 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled A1 reference decoding for core.references.
+
+Optional: built by `python setup.py build_ext --inplace` when Cython and
+a C compiler are available. The rules match the pure-Python fallback in
+core.references exactly: 1-3 ASCII letters (either case) followed by
+1-7 ASCII digits, at most 10 characters in all.
+"""
+
+
+cpdef tuple decode(str ref):
+    """Return (row, column) for an A1 reference, or None if it is invalid."""
+    cdef Py_ssize_t n = len(ref)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t letters
+    cdef Py_UCS4 ch
+    cdef long c
+    cdef long col = 0
+    cdef long row = 0
+
+    if n < 2 or n > 10:
+        return None
+
+    while i < n:
+        ch = ref[i]
+        c = ch
+        if 97 <= c <= 122:  # a-z
+            c -= 32
+        elif not 65 <= c <= 90:  # A-Z
+            break
+        col = col * 26 + (c - 64)
+        i += 1
+
+    letters = i
+    if letters == 0 or letters > 3 or n - letters > 7:
+        return None
+
+    while i < n:
+        ch = ref[i]
+        c = ch
+        if not 48 <= c <= 57:  # 0-9
+            return None
+        row = row * 10 + (c - 48)
+        i += 1
+
+    if n == letters:
+        return None
+    return (row, col)
@@ -11,6 +11,7 @@ License: MIT
 Version: 2.0.0
 """
 
+import io
 import re
 import sys
 import json
@@ -19,11 +20,13 @@ import tempfile
 import shutil
 import traceback
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Tuple, Set
+from typing import Any, BinaryIO, Dict, List, Optional, Union, Tuple, Set
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
 import threading
 import time
+from copy import copy
+import zipfile
 
 try:
     from openpyxl import Workbook, load_workbook
@@ -33,8 +36,13 @@ try:
     from openpyxl.worksheet.worksheet import Worksheet
     from openpyxl.workbook.workbook import Workbook as OpenpyxlWorkbook
     from openpyxl.utils import get_column_letter as openpyxl_get_column_letter
-    from openpyxl.utils import column_index_from_string
     from openpyxl.comments import Comment
+    from openpyxl.styles.stylesheet import write_stylesheet
+    from openpyxl.worksheet._writer import WorksheetWriter
+    from openpyxl.writer.excel import ExcelWriter
+    from openpyxl.packaging.relationship import Relationship, RelationshipList
+    from openpyxl.xml.constants import ARC_SHARED_STRINGS, ARC_WORKBOOK_RELS, SHARED_STRINGS
+    from openpyxl.xml.functions import tostring, fromstring
 except ImportError:
     raise ImportError(
         "openpyxl is required. Install with:\n"
@@ -51,49 +59,24 @@ except ImportError:
     pd = None
 
 
-# ============================================================================
-# EXCEPTIONS
-# ============================================================================
-
-class ExcelAgentError(Exception):
-    """Base exception for all Excel agent errors."""
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(message)
-        self.message = message
-        self.details = details or {}
-    
-    def to_json(self) -> Dict[str, Any]:
-        """Convert exception to JSON-serializable dict."""
-        return {
-            "error": self.__class__.__name__,
-            "message": self.message,
-            "details": self.details
-        }
-
-
-class FormulaError(ExcelAgentError):
-    """Raised when formula creation, validation, or parsing fails."""
-    pass
-
-
-class InvalidCellReferenceError(ExcelAgentError):
-    """Raised when cell reference format is invalid or out of bounds."""
-    pass
-
-
-class ValidationError(ExcelAgentError):
-    """Raised when workbook validation fails or produces errors."""
-    pass
-
-
-class SecurityError(ExcelAgentError):
-    """Raised when potentially dangerous operations are detected."""
-    pass
-
-
-class FileLockError(ExcelAgentError):
-    """Raised when file cannot be locked for exclusive access."""
-    pass
+from .exceptions import (
+    ExcelAgentError, FormulaError, InvalidCellReferenceError, ValidationError,
+    SecurityError, FileLockError
+)
+from .references import (
+    split_cell_reference, decode_cell_reference, is_valid_cell_reference, is_valid_range_reference, parse_range,
+    is_valid_sheet_name, sanitize_sheet_name
+)
+from .formulas import (
+    MAX_FORMULA_LENGTH, MAX_FORMULA_NESTING, sanitize_formula, scan_formula_security,
+    validate_formula_references, prepare_formula
+)
+from .package import (
+    NS_MAIN, NS_DOC_REL, NS_PKG_REL, NS_CONTENT_TYPES, ARC_CONTENT_TYPES, ARC_CALC_CHAIN,
+    get_workbook_part, get_rels_part, read_rels, get_sheet_parts, list_sheet_names, sheet_exists,
+    read_xml_part, write_xml_part, set_manual_calc, drop_calc_chain_refs, NothingToWrite,
+    atomic_write, open_package, read_member
+)
 
 
 # ============================================================================
@@ -137,8 +120,6 @@ STYLE_FORMULA = "FinancialFormula"
 STYLE_ASSUMPTION = "FinancialAssumption"
 
 # Validation constants
-MAX_FORMULA_LENGTH = 8000
-MAX_FORMULA_NESTING = 64
 EXCEL_MAX_ROWS = 1_048_576
 EXCEL_MAX_COLS = 16_384
 
@@ -196,48 +177,13 @@ class FileLock:
 # UTILITY FUNCTIONS
 # ============================================================================
 
-def is_valid_cell_reference(ref: str) -> bool:
-    """Validates Excel cell reference format (e.g., 'A1', 'BZ5000')."""
-    if not ref or not isinstance(ref, str):
-        return False
-    pattern = r'^[A-Z]{1,3}\d{1,7}$'
-    return bool(re.match(pattern, ref.upper()))
-
-
-def is_valid_range_reference(range_ref: str) -> bool:
-    """Validates Excel range reference format (e.g., 'A1:B10')."""
-    if not range_ref:
-        return False
-    
-    # Handle sheet-qualified references
-    if "!" in range_ref:
-        parts = range_ref.split("!")
-        if len(parts) != 2:
-            return False
-        range_ref = parts[1]
-    
-    if ":" not in range_ref:
-        return is_valid_cell_reference(range_ref)
-    
-    parts = range_ref.split(":")
-    if len(parts) != 2:
-        return False
-    
-    return is_valid_cell_reference(parts[0]) and is_valid_cell_reference(parts[1])
-
-
 def get_cell_coordinates(cell_ref: str) -> Tuple[int, int]:
     """Convert Excel cell reference to (row, column) tuple (1-indexed)."""
-    if not is_valid_cell_reference(cell_ref):
+    coordinates = decode_cell_reference(cell_ref)
+    if coordinates is None:
         raise InvalidCellReferenceError(f"Invalid cell reference: {cell_ref}")
     
-    match = re.match(r'^([A-Z]+)(\d+)$', cell_ref.upper())
-    if not match:
-        raise InvalidCellReferenceError(f"Cannot parse reference: {cell_ref}")
-    
-    col_str, row_str = match.groups()
-    col_num = column_index_from_string(col_str)
-    row_num = int(row_str)
+    row_num, col_num = coordinates
     
     if row_num > EXCEL_MAX_ROWS or col_num > EXCEL_MAX_COLS:
         raise InvalidCellReferenceError(f"Reference out of bounds: {cell_ref}")
@@ -252,100 +198,6 @@ def get_column_letter(col_num: int) -> str:
     return openpyxl_get_column_letter(col_num)
 
 
-def parse_range(range_ref: str) -> Tuple[str, str]:
-    """Parse range reference into start and end cells."""
-    if "!" in range_ref:
-        _, range_ref = range_ref.split("!", 1)
-    
-    if ":" not in range_ref:
-        return range_ref, range_ref
-    
-    start, end = range_ref.split(":", 1)
-    return start, end
-
-
-def is_valid_sheet_name(name: str) -> bool:
-    """Validate Excel sheet name."""
-    if not name or len(name) > 31:
-        return False
-    invalid_chars = [':', '\\', '/', '?', '*', '[', ']']
-    return not any(char in name for char in invalid_chars)
-
-
-def sanitize_sheet_name(name: str) -> str:
-    """Sanitize sheet name by removing invalid characters."""
-    if not name:
-        return "Sheet1"
-    
-    # Remove invalid characters
-    for char in [':', '\\', '/', '?', '*', '[', ']']:
-        name = name.replace(char, '_')
-    
-    # Truncate to 31 chars
-    name = name[:31]
-    
-    return name or "Sheet1"
-
-
-# ============================================================================
-# FORMULA SECURITY & VALIDATION
-# ============================================================================
-
-def sanitize_formula(formula: str, allow_external: bool = False) -> Tuple[str, List[str]]:
-    """
-    Sanitize formula for security issues.
-    
-    Returns:
-        Tuple of (sanitized_formula, list_of_warnings)
-    """
-    warnings = []
-    
-    # Ensure formula starts with =
-    if not formula.startswith('='):
-        formula = '=' + formula
-    
-    # Check for dangerous functions
-    dangerous_patterns = [
-        (r'WEBSERVICE\s*\(', 'WEBSERVICE function (network access)'),
-        (r'HYPERLINK\s*\(', 'HYPERLINK function (potential phishing)'),
-        (r'CALL\s*\(', 'CALL function (external DLL execution)'),
-        (r'\[[\w\s]+\.xl', 'External workbook reference'),
-        (r'INDIRECT\s*\(.*HYPERLINK', 'INDIRECT+HYPERLINK combination (security risk)'),
-    ]
-    
-    for pattern, warning in dangerous_patterns:
-        if re.search(pattern, formula, re.IGNORECASE):
-            warnings.append(warning)
-    
-    # Check formula length
-    if len(formula) > MAX_FORMULA_LENGTH:
-        warnings.append(f'Formula exceeds recommended length ({len(formula)} chars)')
-    
-    # Check nesting depth
-    nesting = formula.count('(') - formula.count(')')
-    if abs(nesting) > MAX_FORMULA_NESTING:
-        warnings.append(f'Formula nesting depth suspicious ({nesting})')
-    
-    return formula, warnings
-
-
-def validate_formula_references(formula: str, existing_sheets: List[str]) -> Tuple[bool, Optional[str]]:
-    """Validate all sheet references in formula exist."""
-    if not formula or not isinstance(formula, str):
-        return False, "Formula must be a non-empty string"
-    
-    # Extract sheet names from references (e.g., 'Sheet1'!A1 or Sheet1!A1)
-    sheet_refs = re.findall(r"'([^']+)'!", formula)
-    sheet_refs.extend(re.findall(r"([A-Za-z0-9_]+)!", formula))
-    sheet_refs = list(set(sheet_refs))  # Remove duplicates
-    
-    for sheet_ref in sheet_refs:
-        if sheet_ref not in existing_sheets:
-            return False, f"Referenced sheet '{sheet_ref}' does not exist"
-    
-    return True, None
-
-
 # ============================================================================
 # STYLE MANAGEMENT
 # ============================================================================
@@ -657,6 +509,79 @@ def repair_errors(
     return results
 
 
+# ============================================================================
+# PACKAGE WRITING
+# ============================================================================
+
+class _SharedStringsPart:
+    """Manifest entry for a sharedStrings part copied from the source."""
+    path = "/" + ARC_SHARED_STRINGS
+    mime_type = SHARED_STRINGS
+
+
+class _PackageZipFile(zipfile.ZipFile):
+    """
+    Output archive for IncrementalExcelWriter. openpyxl writes strings
+    inline and never links a sharedStrings part from the workbook, so
+    the copied one is added to the workbook rels as they are written.
+    """
+    
+    shared_strings = False
+    
+    def writestr(self, zinfo_or_arcname, data, *args, **kwargs):
+        if self.shared_strings and zinfo_or_arcname == ARC_WORKBOOK_RELS:
+            rels = RelationshipList.from_tree(fromstring(data))
+            rels.append(Relationship(type="sharedStrings", Target="sharedStrings.xml"))
+            data = tostring(rels.to_tree())
+        super().writestr(zinfo_or_arcname, data, *args, **kwargs)
+
+
+class IncrementalExcelWriter(ExcelWriter):
+    """
+    ExcelWriter that copies unedited worksheets from the source package.
+    
+    clean_parts maps sheet titles to their part in source; those sheets
+    are written as the original XML instead of being re-serialized, and
+    the source sharedStrings part comes along for the cells they
+    reference. Only sheets without relationships belong in clean_parts:
+    the cellXfs they index are kept in order by openpyxl, anything with
+    rels (comments, drawings, tables, hyperlinks) is not.
+    """
+    
+    def __init__(self, workbook, archive: _PackageZipFile, source: zipfile.ZipFile,
+                 clean_parts: Dict[str, str]):
+        super().__init__(workbook, archive)
+        self._source = source
+        self._clean_parts = clean_parts
+        self._shared_strings_part = None
+        if clean_parts:
+            self._shared_strings_part = next(
+                (target for rel_type, target in read_rels(source, get_workbook_part(source)).values()
+                 if rel_type.endswith("/sharedStrings") and target in source.NameToInfo),
+                None
+            )
+    
+    def write_data(self):
+        if self._shared_strings_part is not None:
+            self._archive.writestr(
+                ARC_SHARED_STRINGS, read_member(self._source, self._shared_strings_part)
+            )
+            self.manifest.append(_SharedStringsPart())
+            self._archive.shared_strings = True
+        super().write_data()
+    
+    def write_worksheet(self, ws):
+        part = self._clean_parts.get(ws.title)
+        if part is None:
+            return super().write_worksheet(ws)
+        
+        ws._drawing = None
+        ws._comments = []
+        ws._rels = RelationshipList()
+        self._archive.writestr(ws.path[1:], read_member(self._source, part))
+        self.manifest.append(ws)
+
+
 # ============================================================================
 # MAIN EXCEL AGENT CLASS
 # ============================================================================
@@ -666,11 +591,27 @@ class ExcelAgent:
     Core Excel manipulation class for stateless tool operations.
     """
     
-    def __init__(self, filepath: Optional[Path] = None):
-        """Initialize agent with optional file."""
+    def __init__(self, filepath: Optional[Path] = None, validate_only: bool = False):
+        """
+        Initialize agent with optional file.
+        
+        With validate_only, open() loads the workbook read-only for
+        inspection (sheet names, values); nothing is locked or saved.
+        """
         self.filepath = Path(filepath) if filepath else None
+        self.validate_only = validate_only
         self.wb: Optional[OpenpyxlWorkbook] = None
         self._lock: Optional[FileLock] = None
+        # Sheets edited (or handed out by get_sheet()) since the last save
+        self._dirty_sheets: Set[str] = set()
+        # File the unedited sheets can be copied from on save: path,
+        # (mtime_ns, size) when read, and title -> worksheet it holds
+        self._source: Optional[Path] = None
+        self._source_stat: Optional[Tuple[int, int]] = None
+        self._source_sheets: Dict[str, Any] = {}
+        # (named style, number format) -> resolved StyleArray, so repeated
+        # edits with the same styling skip the named-style lookups
+        self._style_cache: Dict[Tuple[str, Optional[str]], Any] = {}
     
     def create_new(self, sheets: List[str]) -> None:
         """Create new workbook with specified sheets."""
@@ -688,12 +629,37 @@ class ExcelAgent:
         # Create financial styles
         create_financial_styles(self.wb)
     
+    @classmethod
+    def open_for_write(cls, filepath: Path, acquire_lock: bool = True) -> "ExcelAgent":
+        """
+        Construct an agent with filepath already opened (and locked).
+        
+        Use as `with ExcelAgent.open_for_write(path) as agent:`. The lock
+        is released again if opening fails.
+        """
+        filepath = Path(filepath)
+        agent = cls(filepath)
+        try:
+            agent.open(filepath, acquire_lock=acquire_lock)
+        except BaseException:
+            agent.close()
+            raise
+        return agent
+    
     def open(self, filepath: Path, acquire_lock: bool = True) -> None:
         """Open existing workbook."""
         if not filepath.exists():
             raise FileNotFoundError(f"File not found: {filepath}")
         
         self.filepath = filepath
+        self._dirty_sheets.clear()
+        self._style_cache.clear()
+        
+        if self.validate_only:
+            # Sheets are parsed lazily and styles are left alone. Formulas
+            # stay visible so callers can compare against what would be written
+            self.wb = load_workbook(filepath, read_only=True, keep_links=False)
+            return
         
         # Acquire lock if requested
         if acquire_lock:
@@ -701,25 +667,244 @@ class ExcelAgent:
             if not self._lock.acquire():
                 raise FileLockError(f"Could not lock file: {filepath}")
         
-        self.wb = load_workbook(filepath)
+        # Macros are only carried through for macro-enabled workbooks
+        self.wb = load_workbook(filepath, keep_vba=filepath.suffix.lower() == '.xlsm')
+        self._remember_source(filepath)
         
         # Ensure financial styles exist
         create_financial_styles(self.wb)
     
-    def save(self, filepath: Optional[Path] = None) -> None:
-        """Save workbook."""
+    def open_stream(self, source: BinaryIO) -> None:
+        """
+        Load a workbook from a binary file object (e.g. stdin).
+        
+        There is no file to lock or save back to; write the result out
+        with save_stream().
+        """
+        self.filepath = None
+        self._dirty_sheets.clear()
+        self._style_cache.clear()
+        self._source = None
+        
+        self.wb = load_workbook(source, read_only=self.validate_only, keep_links=not self.validate_only)
+        if not self.validate_only:
+            create_financial_styles(self.wb)
+    
+    def _set_manual_calc(self) -> None:
+        """Manual calculation, no full recalc when Excel next opens the file."""
+        self.wb.calculation.calcMode = "manual"
+        self.wb.calculation.fullCalcOnLoad = None
+    
+    def save(
+        self,
+        filepath: Optional[Path] = None,
+        no_recalc: bool = False,
+        copy_unedited: bool = False
+    ) -> None:
+        """
+        Save workbook.
+        
+        no_recalc switches the workbook to manual calculation so Excel
+        does not recompute every formula on the next open.
+        
+        copy_unedited copies the XML of sheets never fetched through
+        get_sheet() (which the edit methods all use) from the file they
+        were read from instead of rebuilding it. Only pass it when every
+        edit went through those methods: changes made directly on
+        agent.wb are not seen and would be lost.
+        """
         if not self.wb:
             raise ExcelAgentError("No workbook loaded")
         
+        if self.validate_only:
+            raise ExcelAgentError("Workbook was opened validate-only")
+        
+        if no_recalc:
+            self._set_manual_calc()
+        
         target = filepath or self.filepath
         if not target:
             raise ExcelAgentError("No output path specified")
         
         target = Path(target)
-        target.parent.mkdir(parents=True, exist_ok=True)
         
-        self.wb.save(target)
+        # Never leave a half-written workbook behind if the save fails
+        with atomic_write(target) as f:
+            self._write_package(f, copy_unedited)
         self.filepath = target
+        self._dirty_sheets.clear()
+        self._remember_source(target)
+    
+    def save_stream(
+        self,
+        out: BinaryIO,
+        no_recalc: bool = False,
+        copy_unedited: bool = False
+    ) -> None:
+        """
+        Write the workbook to a binary file object; no file is changed.
+        
+        copy_unedited works as in save().
+        """
+        if not self.wb:
+            raise ExcelAgentError("No workbook loaded")
+        
+        if self.validate_only:
+            raise ExcelAgentError("Workbook was opened validate-only")
+        
+        if no_recalc:
+            self._set_manual_calc()
+        
+        self._write_package(out, copy_unedited)
+    
+    def _remember_source(self, filepath: Path) -> None:
+        """Record filepath as matching the loaded workbook sheet for sheet."""
+        st = filepath.stat()
+        self._source = filepath
+        self._source_stat = (st.st_mtime_ns, st.st_size)
+        self._source_sheets = {ws.title: ws for ws in self.wb.worksheets}
+    
+    def _write_package(self, f, copy_unedited: bool = False) -> None:
+        """
+        Serialize the workbook to f. With copy_unedited, the XML of sheets
+        that have not been edited since they were read is copied instead
+        of rebuilt.
+        """
+        source = self._source
+        if not copy_unedited or self.wb.write_only or source is None:
+            self.wb.save(f)
+            return
+        try:
+            st = source.stat()
+        except OSError:
+            st = None
+        if st is None or (st.st_mtime_ns, st.st_size) != self._source_stat:
+            self.wb.save(f)
+            return
+        
+        with open_package(source) as src:
+            clean = self._clean_sheet_parts(src)
+            if not clean:
+                self.wb.save(f)
+                return
+            archive = _PackageZipFile(f, "w", zipfile.ZIP_DEFLATED, allowZip64=True)
+            self.wb.properties.modified = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+            IncrementalExcelWriter(self.wb, archive, src, clean).save()
+    
+    def _clean_sheet_parts(self, archive: zipfile.ZipFile) -> Dict[str, str]:
+        """Sheets that can be copied verbatim from archive, title -> part."""
+        sheet_parts = get_sheet_parts(archive)
+        clean = {}
+        for ws in self.wb.worksheets:
+            title = ws.title
+            part = sheet_parts.get(title)
+            if (part is None or title in self._dirty_sheets
+                    or self._source_sheets.get(title) is not ws
+                    or part not in archive.NameToInfo
+                    or get_rels_part(part) in archive.NameToInfo
+                    or ws.legacy_drawing is not None
+                    or ws._images or ws._charts or ws._tables or ws._pivots):
+                continue
+            clean[title] = part
+        return clean
+    
+    def save_incremental(self, no_recalc: bool = False) -> bool:
+        """
+        Save in place, re-serializing only the sheets edited through
+        set_cell_value() and styles.xml; every other part is copied from
+        the file on disk.
+        
+        Falls back to a full save() whenever the edit touched anything
+        else the package would need (sheet list, comments, hyperlinks,
+        tables, drawings, sheet relationships). Returns True if the
+        incremental path was taken.
+        
+        Like save(copy_unedited=True), only edits made through get_sheet()
+        and the edit methods are saved.
+        """
+        if not self.wb:
+            raise ExcelAgentError("No workbook loaded")
+        
+        if self.validate_only:
+            raise ExcelAgentError("Workbook was opened validate-only")
+        
+        if not self.filepath or not self.filepath.exists():
+            self.save(no_recalc=no_recalc, copy_unedited=True)
+            return False
+        
+        # The source is closed before atomic_write() swaps the new file in
+        written = False
+        with atomic_write(self.filepath) as f:
+            with zipfile.ZipFile(self.filepath) as zin:
+                patched = self._incremental_parts(zin)
+                if patched is None:
+                    raise NothingToWrite
+                
+                workbook_part = get_workbook_part(zin)
+                if no_recalc:
+                    self._set_manual_calc()
+                    workbook_root, workbook_ns = read_xml_part(zin.read(workbook_part))
+                    set_manual_calc(workbook_root)
+                    patched[workbook_part] = write_xml_part(workbook_root, workbook_ns)
+                
+                # openpyxl never writes a calculation chain either
+                workbook_rels = get_rels_part(workbook_part)
+                with zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as zout:
+                    for info in zin.infolist():
+                        name = info.filename
+                        if name == ARC_CALC_CHAIN:
+                            continue
+                        if name in patched:
+                            data = patched[name]
+                        else:
+                            data = zin.read(info)
+                            if name in (ARC_CONTENT_TYPES, workbook_rels) and ARC_CALC_CHAIN in zin.NameToInfo:
+                                data = drop_calc_chain_refs(name, data)
+                        zout.writestr(info, data)
+            written = True
+        
+        if not written:
+            self.save(no_recalc=no_recalc, copy_unedited=True)
+            return False
+        
+        self._dirty_sheets.clear()
+        self._remember_source(self.filepath)
+        return True
+    
+    def _incremental_parts(self, archive: zipfile.ZipFile) -> Optional[Dict[str, bytes]]:
+        """Serialize the parts save_incremental() rewrites, or None if it can't."""
+        sheet_parts = get_sheet_parts(archive)
+        if list(sheet_parts) != self.wb.sheetnames:
+            return None
+        
+        workbook_part = get_workbook_part(archive)
+        styles_part = next(
+            (target for rel_type, target in read_rels(archive, workbook_part).values()
+             if rel_type.endswith("/styles")),
+            None
+        )
+        if styles_part is None or styles_part not in archive.NameToInfo:
+            return None
+        
+        patched = {}
+        for title in self._dirty_sheets:
+            if title not in sheet_parts:
+                return None
+            part = sheet_parts[title]
+            ws = self.wb[title]
+            if (not isinstance(ws, Worksheet) or get_rels_part(part) in archive.NameToInfo
+                    or ws.legacy_drawing is not None
+                    or ws._images or ws._charts or ws._tables or ws._pivots):
+                return None
+            
+            writer = WorksheetWriter(ws, out=io.BytesIO())
+            writer.write()
+            if writer._rels or ws._comments:
+                return None
+            patched[part] = writer.read()
+        
+        patched[styles_part] = tostring(write_stylesheet(self.wb))
+        return patched
     
     def close(self) -> None:
         """Close workbook and release lock."""
@@ -742,6 +927,8 @@ class ExcelAgent:
         if name not in self.wb.sheetnames:
             raise KeyError(f"Sheet '{name}' not found. Available: {self.wb.sheetnames}")
         
+        # Callers may edit the sheet directly, so save() rebuilds it
+        self._dirty_sheets.add(name)
         return self.wb[name]
     
     def add_sheet(self, name: str, index: Optional[int] = None) -> Worksheet:
@@ -770,9 +957,20 @@ class ExcelAgent:
         target_cell = ws[cell]
         target_cell.value = value
         
-        if style and style in self.wb.named_styles:
-            target_cell.style = style
+        if style:
+            key = (style, number_format or None)
+            cached = self._style_cache.get(key)
+            if cached is not None:
+                target_cell._style = copy(cached)
+                return
+            if style in self.wb.named_styles:
+                target_cell.style = style
+                if number_format:
+                    target_cell.number_format = number_format
+                self._style_cache[key] = copy(target_cell._style)
+                return
         
+        # Without a named style the format merges into the cell's own style
         if number_format:
             target_cell.number_format = number_format
     
@@ -785,19 +983,7 @@ class ExcelAgent:
         allow_external: bool = False
     ) -> None:
         """Add validated formula to cell."""
-        # Sanitize formula
-        formula, warnings = sanitize_formula(formula, allow_external)
-        
-        if warnings and not allow_external:
-            raise SecurityError(
-                f"Formula contains potentially unsafe operations: {'; '.join(warnings)}"
-            )
-        
-        # Validate references
-        if validate_refs:
-            is_valid, error = validate_formula_references(formula, self.wb.sheetnames)
-            if not is_valid:
-                raise FormulaError(f"Invalid reference: {error}")
+        formula = prepare_formula(formula, self.wb.sheetnames, validate_refs, allow_external)
         
         self.set_cell_value(sheet, cell, formula, style=STYLE_FORMULA)
     
@@ -1047,27 +1233,33 @@ def export_sheet_to_csv(
     """Export sheet to CSV."""
     import csv
     
-    with ExcelAgent(filepath) as agent:
-        agent.open(filepath, acquire_lock=False)
-        ws = agent.get_sheet(sheet)
+    # Read-only mode streams rows without materializing styled cells
+    wb = load_workbook(filepath, read_only=True)
+    try:
+        if sheet not in wb.sheetnames:
+            raise KeyError(f"Sheet '{sheet}' not found. Available: {wb.sheetnames}")
+        ws = wb[sheet]
         
         if range_ref:
             start_cell, end_cell = parse_range(range_ref)
             start_row, start_col = get_cell_coordinates(start_cell)
             end_row, end_col = get_cell_coordinates(end_cell)
             rows = ws.iter_rows(min_row=start_row, max_row=end_row,
-                               min_col=start_col, max_col=end_col)
+                               min_col=start_col, max_col=end_col,
+                               values_only=True)
         else:
-            rows = ws.iter_rows()
+            rows = ws.iter_rows(values_only=True)
         
         with open(output, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             row_count = 0
             for row in rows:
-                writer.writerow([cell.value for cell in row])
+                writer.writerow(row)
                 row_count += 1
         
         return row_count
+    finally:
+        wb.close()
 
 
 # ============================================================================
@@ -1078,6 +1270,7 @@ __version__ = "2.0.0"
 __all__ = [
     # Core class
     "ExcelAgent",
+    "IncrementalExcelWriter",
     
     # Exceptions
     "ExcelAgentError",
@@ -1093,6 +1286,8 @@ __all__ = [
     "repair_errors",
     
     # Utilities
+    "split_cell_reference",
+    "decode_cell_reference",
     "is_valid_cell_reference",
     "is_valid_range_reference",
     "get_cell_coordinates",
@@ -1100,6 +1295,23 @@ __all__ = [
     "is_valid_sheet_name",
     "sanitize_sheet_name",
     "get_number_format",
+    "scan_formula_security",
+    "prepare_formula",
+    
+    # Package-level access
+    "get_workbook_part",
+    "get_rels_part",
+    "read_rels",
+    "get_sheet_parts",
+    "list_sheet_names",
+    "sheet_exists",
+    "read_xml_part",
+    "write_xml_part",
+    "drop_calc_chain_refs",
+    "atomic_write",
+    "open_package",
+    "ARC_CONTENT_TYPES",
+    "ARC_CALC_CHAIN",
     
     # Convenience functions
     "create_workbook_from_structure",
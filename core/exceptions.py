@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Excel Agent Exceptions
+
+Kept free of openpyxl so CLI tools can import them without paying the
+workbook library's import cost on validation and error paths.
+"""
+
+from typing import Any, Dict, Optional
+
+
+# ============================================================================
+# EXCEPTIONS
+# ============================================================================
+
+class ExcelAgentError(Exception):
+    """Base exception for all Excel agent errors."""
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.message = message
+        self.details = details or {}
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Convert exception to JSON-serializable dict."""
+        return {
+            "error": self.__class__.__name__,
+            "message": self.message,
+            "details": self.details
+        }
+
+
+class FormulaError(ExcelAgentError):
+    """Raised when formula creation, validation, or parsing fails."""
+    pass
+
+
+class InvalidCellReferenceError(ExcelAgentError):
+    """Raised when cell reference format is invalid or out of bounds."""
+    pass
+
+
+class ValidationError(ExcelAgentError):
+    """Raised when workbook validation fails or produces errors."""
+    pass
+
+
+class SecurityError(ExcelAgentError):
+    """Raised when potentially dangerous operations are detected."""
+    pass
+
+
+class FileLockError(ExcelAgentError):
+    """Raised when file cannot be locked for exclusive access."""
+    pass
+
+
+__all__ = [
+    "ExcelAgentError",
+    "FormulaError",
+    "InvalidCellReferenceError",
+    "ValidationError",
+    "SecurityError",
+    "FileLockError",
+]
@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+Excel Fast Patch
+
+Single-cell edits applied directly to the worksheet XML inside the .xlsx
+package. Only the parts that change are re-serialized; every other member
+is copied through as-is, so a one-cell edit costs one sheet parse instead
+of a full openpyxl load and save.
+
+The patch never guesses: whenever the edit needs something it cannot
+reproduce exactly (a new entry in styles.xml, a merged or shared-formula
+cell, a sheet without a comments part, ...) it raises
+FastPatchUnsupported and the caller falls back to ExcelAgent.
+"""
+
+import math
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles.numbers import BUILTIN_FORMATS_REVERSE
+
+from .exceptions import ExcelAgentError
+from .package import (
+    NS_MAIN, NS_DOC_REL, ARC_CONTENT_TYPES, ARC_CALC_CHAIN,
+    get_workbook_part, get_sheet_parts, get_rels_part, read_rels,
+    read_xml_part, write_xml_part, get_calc_pr, set_manual_calc,
+    drop_calc_chain_refs, NothingToWrite, atomic_write, open_package, read_member
+)
+from .excel_agent_core import (
+    STYLE_FORMULA, STYLE_ASSUMPTION,
+    FileLock, get_cell_coordinates, get_column_letter, prepare_formula
+)
+
+
+class FastPatchUnsupported(ExcelAgentError):
+    """The edit cannot be applied in place; use the openpyxl path."""
+    pass
+
+
+NS_VML = "urn:schemas-microsoft-com:vml"
+NS_OFFICE = "urn:schemas-microsoft-com:office:office"
+NS_EXCEL = "urn:schemas-microsoft-com:office:excel"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+COMMENT_AUTHOR = "ExcelAgent"
+
+_TAG_C = f"{{{NS_MAIN}}}c"
+_TAG_F = f"{{{NS_MAIN}}}f"
+_TAG_ROW = f"{{{NS_MAIN}}}row"
+
+
+def _q(tag: str) -> str:
+    """Qualify a SpreadsheetML tag name."""
+    return f"{{{NS_MAIN}}}{tag}"
+
+
+# ============================================================================
+# STYLES
+# ============================================================================
+
+def _find_cell_xf(styles_root: ET.Element, style_name: str, number_format: Optional[str]) -> int:
+    """
+    Find the cellXfs index openpyxl would give a cell with this named
+    style and number format, without adding anything to styles.xml.
+    """
+    style_xfs = styles_root.find(_q("cellStyleXfs"))
+    cell_xfs = styles_root.find(_q("cellXfs"))
+    cell_styles = styles_root.find(_q("cellStyles"))
+    if style_xfs is None or cell_xfs is None or cell_styles is None:
+        raise FastPatchUnsupported("Workbook has no cell styles")
+
+    xf_id = None
+    for cell_style in cell_styles.iter(_q("cellStyle")):
+        if cell_style.get("name") == style_name:
+            xf_id = cell_style.get("xfId")
+            break
+    if xf_id is None:
+        raise FastPatchUnsupported(f"Named style '{style_name}' not registered")
+
+    base = list(style_xfs.iter(_q("xf")))[int(xf_id)]
+
+    if number_format is None:
+        num_fmt_id = base.get("numFmtId", "0")
+    elif number_format in BUILTIN_FORMATS_REVERSE:
+        num_fmt_id = str(BUILTIN_FORMATS_REVERSE[number_format])
+    else:
+        num_fmt_id = None
+        for num_fmt in styles_root.iter(_q("numFmt")):
+            if num_fmt.get("formatCode") == number_format:
+                num_fmt_id = num_fmt.get("numFmtId")
+                break
+        if num_fmt_id is None:
+            raise FastPatchUnsupported(f"Number format not registered: {number_format}")
+
+    wanted = {
+        "numFmtId": num_fmt_id,
+        "fontId": base.get("fontId", "0"),
+        "fillId": base.get("fillId", "0"),
+        "borderId": base.get("borderId", "0"),
+        "xfId": xf_id,
+    }
+    base_alignment = base.find(_q("alignment"))
+    base_alignment = base_alignment.attrib if base_alignment is not None else None
+
+    for index, xf in enumerate(cell_xfs.iter(_q("xf"))):
+        if any(xf.get(key, "0") != value for key, value in wanted.items()):
+            continue
+        if xf.get("quotePrefix", "0") not in ("0", "false") or xf.get("pivotButton", "0") not in ("0", "false"):
+            continue
+        if xf.find(_q("protection")) is not None:
+            continue
+        alignment = xf.find(_q("alignment"))
+        if (alignment.attrib if alignment is not None else None) != base_alignment:
+            continue
+        return index
+
+    raise FastPatchUnsupported("Cell style would need a new styles.xml entry")
+
+
+# ============================================================================
+# WORKSHEET
+# ============================================================================
+
+def _covers(ref: str, row: int, col: int) -> bool:
+    """Check whether an A1 or A1:B2 reference covers (row, col)."""
+    start, _, end = ref.partition(":")
+    min_row, min_col = get_cell_coordinates(start.replace("$", ""))
+    max_row, max_col = get_cell_coordinates((end or start).replace("$", ""))
+    return min_row <= row <= max_row and min_col <= col <= max_col
+
+
+def _locate_cell(sheet_root: ET.Element, row: int, col: int) -> Tuple[ET.Element, ET.Element]:
+    """Find or create the <row> and <c> elements for (row, col)."""
+    sheet_data = sheet_root.find(_q("sheetData"))
+    if sheet_data is None:
+        raise FastPatchUnsupported("Worksheet has no sheetData")
+
+    row_elem = None
+    row_pos = len(sheet_data)
+    for pos, elem in enumerate(sheet_data):
+        r = elem.get("r")
+        if r is None:
+            raise FastPatchUnsupported("Row without explicit index")
+        r = int(r)
+        if r == row:
+            row_elem = elem
+            break
+        if r > row:
+            row_pos = pos
+            break
+
+    if row_elem is None:
+        row_elem = ET.Element(_TAG_ROW, r=str(row))
+        sheet_data.insert(row_pos, row_elem)
+
+    spans = row_elem.get("spans")
+    if spans:
+        low, _, high = spans.partition(":")
+        if high and not int(low) <= col <= int(high):
+            row_elem.set("spans", f"{min(int(low), col)}:{max(int(high), col)}")
+
+    cell_pos = len(row_elem)
+    for pos, elem in enumerate(row_elem):
+        if elem.tag != _TAG_C:
+            cell_pos = pos
+            break
+        r = elem.get("r")
+        if r is None:
+            raise FastPatchUnsupported("Cell without explicit reference")
+        _, c = get_cell_coordinates(r)
+        if c == col:
+            return row_elem, elem
+        if c > col:
+            cell_pos = pos
+            break
+
+    cell_elem = ET.Element(_TAG_C, r=f"{get_column_letter(col)}{row}")
+    row_elem.insert(cell_pos, cell_elem)
+    return row_elem, cell_elem
+
+
+def _check_patchable(sheet_root: ET.Element, row: int, col: int) -> None:
+    """Refuse cells inside merged ranges or shared/array formula blocks."""
+    merge_cells = sheet_root.find(_q("mergeCells"))
+    if merge_cells is not None:
+        for merged in merge_cells:
+            if _covers(merged.get("ref", ""), row, col):
+                raise FastPatchUnsupported("Cell is part of a merged range")
+
+    for formula in sheet_root.iter(_TAG_F):
+        ref = formula.get("ref")
+        if ref and _covers(ref, row, col):
+            raise FastPatchUnsupported("Cell is part of a shared or array formula")
+
+
+def _write_cell(cell_elem: ET.Element, value: Any, xf_index: Optional[int]) -> bool:
+    """
+    Replace the content of a <c> element. Strings starting with '=' are
+    formulas, as in openpyxl. An xf_index of None keeps the cell's current
+    style. Returns True if the cell held a formula.
+    """
+    had_formula = cell_elem.find(_TAG_F) is not None
+
+    for child in list(cell_elem):
+        if child.tag != _q("extLst"):
+            cell_elem.remove(child)
+    for attr in ("t", "cm", "vm", "ph"):
+        cell_elem.attrib.pop(attr, None)
+
+    if xf_index is not None:
+        cell_elem.attrib.pop("s", None)
+        if xf_index:
+            cell_elem.set("s", str(xf_index))
+
+    content = []
+    if value is None:
+        pass
+    elif isinstance(value, bool):
+        cell_elem.set("t", "b")
+        v = ET.Element(_q("v"))
+        v.text = "1" if value else "0"
+        content.append(v)
+    elif isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            raise FastPatchUnsupported("Non-finite number")
+        v = ET.Element(_q("v"))
+        v.text = repr(value)
+        content.append(v)
+    elif isinstance(value, str):
+        if ILLEGAL_CHARACTERS_RE.search(value):
+            raise FastPatchUnsupported("String contains illegal characters")
+        if len(value) > 1 and value.startswith("="):
+            f = ET.Element(_TAG_F)
+            f.text = value[1:]
+            content.append(f)
+        else:
+            # Inline, so sharedStrings.xml is never touched; preserve keeps
+            # leading/trailing and repeated whitespace exactly as given
+            cell_elem.set("t", "inlineStr")
+            is_elem = ET.Element(_q("is"))
+            t = ET.SubElement(is_elem, _q("t"), {XML_SPACE: "preserve"})
+            t.text = value
+            content.append(is_elem)
+    else:
+        raise FastPatchUnsupported(f"Unsupported value type: {type(value).__name__}")
+
+    for pos, child in enumerate(content):
+        cell_elem.insert(pos, child)
+
+    return had_formula
+
+
+def _extend_dimension(sheet_root: ET.Element, row: int, col: int) -> None:
+    """Grow the <dimension> ref so it includes (row, col)."""
+    dimension = sheet_root.find(_q("dimension"))
+    if dimension is None or not dimension.get("ref"):
+        return
+    start, _, end = dimension.get("ref").partition(":")
+    try:
+        min_row, min_col = get_cell_coordinates(start)
+        max_row, max_col = get_cell_coordinates(end or start)
+    except ExcelAgentError:
+        return
+    dimension.set("ref", (
+        f"{get_column_letter(min(min_col, col))}{min(min_row, row)}:"
+        f"{get_column_letter(max(max_col, col))}{max(max_row, row)}"
+    ))
+
+
+# ============================================================================
+# COMMENTS
+# ============================================================================
+
+def _set_comment(comments_root: ET.Element, ref: str, text: str) -> None:
+    """Add or replace the comment on a cell in a comments part."""
+    authors = comments_root.find(_q("authors"))
+    comment_list = comments_root.find(_q("commentList"))
+    if authors is None or comment_list is None:
+        raise FastPatchUnsupported("Malformed comments part")
+
+    names = [author.text for author in authors]
+    if COMMENT_AUTHOR in names:
+        author_id = names.index(COMMENT_AUTHOR)
+    else:
+        ET.SubElement(authors, _q("author")).text = COMMENT_AUTHOR
+        author_id = len(names)
+
+    for comment in list(comment_list):
+        if comment.get("ref") == ref:
+            comment_list.remove(comment)
+
+    comment = ET.SubElement(comment_list, _q("comment"), ref=ref, authorId=str(author_id))
+    t = ET.SubElement(ET.SubElement(comment, _q("text")), _q("t"))
+    t.text = text
+    if text != text.strip():
+        t.set(XML_SPACE, "preserve")
+
+
+def _set_comment_shape(vml_root: ET.Element, row: int, col: int) -> None:
+    """Add or replace the hidden note shape for a cell in a VML drawing."""
+    shape_tag = f"{{{NS_VML}}}shape"
+    shape_ids = []
+    for shape in list(vml_root.iter(shape_tag)):
+        client = shape.find(f"{{{NS_EXCEL}}}ClientData")
+        if client is not None and client.get("ObjectType") == "Note":
+            if (client.findtext(f"{{{NS_EXCEL}}}Row") == str(row - 1)
+                    and client.findtext(f"{{{NS_EXCEL}}}Column") == str(col - 1)):
+                vml_root.remove(shape)
+                continue
+        shape_id = shape.get("id", "")
+        if shape_id.startswith("_x0000_s") and shape_id[8:].isdigit():
+            shape_ids.append(int(shape_id[8:]))
+
+    if vml_root.find(f"{{{NS_VML}}}shapetype[@id='_x0000_t202']") is None:
+        raise FastPatchUnsupported("VML drawing has no note shape type")
+
+    # Same shape openpyxl writes for a comment of default size
+    shape = ET.SubElement(vml_root, shape_tag, {
+        "id": "_x0000_s%04d" % (max(shape_ids, default=1025) + 1),
+        "type": "#_x0000_t202",
+        "style": ("position:absolute; margin-left:59.25pt;margin-top:1.5pt;"
+                  "width:144px;height:79px;z-index:1;visibility:hidden"),
+        "fillcolor": "#ffffe1",
+        f"{{{NS_OFFICE}}}insetmode": "auto",
+    })
+    ET.SubElement(shape, f"{{{NS_VML}}}fill", color2="#ffffe1")
+    ET.SubElement(shape, f"{{{NS_VML}}}shadow", color="black", obscured="t")
+    ET.SubElement(shape, f"{{{NS_VML}}}path", {f"{{{NS_OFFICE}}}connecttype": "none"})
+    textbox = ET.SubElement(shape, f"{{{NS_VML}}}textbox", style="mso-direction-alt:auto")
+    ET.SubElement(textbox, "div", style="text-align:left")
+    client = ET.SubElement(shape, f"{{{NS_EXCEL}}}ClientData", ObjectType="Note")
+    ET.SubElement(client, f"{{{NS_EXCEL}}}MoveWithCells")
+    ET.SubElement(client, f"{{{NS_EXCEL}}}SizeWithCells")
+    ET.SubElement(client, f"{{{NS_EXCEL}}}AutoFill").text = "False"
+    ET.SubElement(client, f"{{{NS_EXCEL}}}Row").text = str(row - 1)
+    ET.SubElement(client, f"{{{NS_EXCEL}}}Column").text = str(col - 1)
+
+
+def _comment_parts(archive: zipfile.ZipFile, sheet_root: ET.Element, sheet_part: str) -> Tuple[str, str]:
+    """Return the (comments, vmlDrawing) parts already attached to a sheet."""
+    rels = read_rels(archive, sheet_part)
+    comments_part = next(
+        (target for rel_type, target in rels.values() if rel_type.endswith("/comments")),
+        None
+    )
+    legacy = sheet_root.find(_q("legacyDrawing"))
+    rel = rels.get(legacy.get(f"{{{NS_DOC_REL}}}id")) if legacy is not None else None
+    if comments_part is None or rel is None:
+        raise FastPatchUnsupported("Sheet has no comments part yet")
+    return comments_part, rel[1]
+
+
+# ============================================================================
+# PATCHING
+# ============================================================================
+
+def _text_of(elem: ET.Element) -> str:
+    """Text of an <si> or <is> element: its <t>, or its runs' <t> joined."""
+    t = elem.find(_q("t"))
+    if t is not None:
+        return t.text or ""
+    return "".join(run.findtext(_q("t"), "") for run in elem.iter(_q("r")))
+
+
+def _shared_string(archive: zipfile.ZipFile, workbook_part: str, index: int) -> Optional[str]:
+    """Entry index of the shared strings table, or None if there is none."""
+    sst_part = next(
+        (target for rel_type, target in read_rels(archive, workbook_part).values()
+         if rel_type.endswith("/sharedStrings")),
+        None
+    )
+    if sst_part is None or sst_part not in archive.NameToInfo:
+        return None
+
+    tag_si = _q("si")
+    seen = 0
+    with archive.open(sst_part) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag == tag_si:
+                if seen == index:
+                    return _text_of(elem)
+                seen += 1
+                elem.clear()
+    return None
+
+
+def _cell_holds(
+    archive: zipfile.ZipFile,
+    workbook_part: str,
+    cell_elem: ET.Element,
+    value: Any,
+    xf_index: Optional[int]
+) -> bool:
+    """
+    Whether cell_elem already holds value (and xf_index, unless None), as
+    _write_cell would write it. Numbers compare by value, so 1 matches 1.0;
+    a bool only matches a boolean cell.
+    """
+    if xf_index is not None and int(cell_elem.get("s", "0")) != xf_index:
+        return False
+
+    t = cell_elem.get("t", "n")
+    f = cell_elem.find(_TAG_F)
+    v = cell_elem.findtext(_q("v"))
+
+    if value is None:
+        return f is None and v is None and cell_elem.find(_q("is")) is None
+    if isinstance(value, str) and len(value) > 1 and value.startswith("="):
+        return f is not None and not f.attrib and f.text == value[1:]
+    if f is not None:
+        return False
+    if isinstance(value, bool):
+        return t == "b" and v == ("1" if value else "0")
+    if isinstance(value, (int, float)):
+        try:
+            return t == "n" and v is not None and float(v) == value
+        except ValueError:
+            return False
+    if isinstance(value, str):
+        if t == "inlineStr":
+            is_elem = cell_elem.find(_q("is"))
+            return is_elem is not None and _text_of(is_elem) == value
+        if t == "s" and v is not None and v.isdigit():
+            return _shared_string(archive, workbook_part, int(v)) == value
+    return False
+
+
+def _patch_single_cell(
+    filepath: Path,
+    sheet: str,
+    cell_addr: str,
+    value: Any,
+    style: Optional[str],
+    number_format: Optional[str] = None,
+    comment: Optional[str] = None,
+    no_recalc: bool = False,
+    skip_unchanged: bool = False
+) -> bool:
+    """
+    Set one cell (value or '=formula'), its named style and optional number
+    format and comment, rewriting only the parts that change. Without a
+    style the cell keeps whatever style it already has. no_recalc switches
+    the workbook to manual calculation and drops calcChain.
+
+    With skip_unchanged, a cell that already holds the value and style is
+    left alone and nothing is written. Returns whether the file was
+    written.
+
+    Raises FastPatchUnsupported before anything is written if the edit
+    cannot be made in place.
+    """
+    row, col = get_cell_coordinates(cell_addr)
+    cell_addr = f"{get_column_letter(col)}{row}"
+
+    # The source is closed before atomic_write() swaps the new file in
+    written = False
+    with atomic_write(filepath) as f:
+        with open_package(filepath) as zin:
+            sheet_part = get_sheet_parts(zin).get(sheet)
+            if sheet_part is None:
+                raise FastPatchUnsupported(f"Sheet '{sheet}' not found")
+            workbook_part = get_workbook_part(zin)
+
+            if style is None:
+                if number_format is not None:
+                    # Merging a format into the cell's own style needs a new xf
+                    raise FastPatchUnsupported("Number format without a named style")
+                xf_index = None
+            else:
+                styles_part = next(
+                    (target for rel_type, target in read_rels(zin, workbook_part).values()
+                     if rel_type.endswith("/styles")),
+                    None
+                )
+                if styles_part is None:
+                    raise FastPatchUnsupported("Workbook has no styles part")
+                xf_index = _find_cell_xf(ET.fromstring(zin.read(styles_part)), style, number_format)
+
+            sheet_root, sheet_ns = read_xml_part(read_member(zin, sheet_part))
+            _check_patchable(sheet_root, row, col)
+            _, cell_elem = _locate_cell(sheet_root, row, col)
+            if (skip_unchanged and comment is None
+                    and _cell_holds(zin, workbook_part, cell_elem, value, xf_index)):
+                raise NothingToWrite
+            had_formula = _write_cell(cell_elem, value, xf_index)
+            _extend_dimension(sheet_root, row, col)
+
+            patched = {sheet_part: write_xml_part(sheet_root, sheet_ns)}
+
+            if comment is not None:
+                comments_part, vml_part = _comment_parts(zin, sheet_root, sheet_part)
+                comments_root, comments_ns = read_xml_part(zin.read(comments_part))
+                _set_comment(comments_root, cell_addr, comment)
+                patched[comments_part] = write_xml_part(comments_root, comments_ns)
+                try:
+                    vml_root, vml_ns = read_xml_part(zin.read(vml_part))
+                except ET.ParseError:
+                    raise FastPatchUnsupported("VML drawing is not well-formed XML")
+                _set_comment_shape(vml_root, row, col)
+                patched[vml_part] = write_xml_part(vml_root, vml_ns)
+
+            if no_recalc:
+                workbook_root, workbook_ns = read_xml_part(zin.read(workbook_part))
+                set_manual_calc(workbook_root)
+                patched[workbook_part] = write_xml_part(workbook_root, workbook_ns)
+            elif isinstance(value, str) and len(value) > 1 and value.startswith("="):
+                # New formulas carry no cached value; have Excel compute on open
+                workbook_root, workbook_ns = read_xml_part(zin.read(workbook_part))
+                calc_pr = get_calc_pr(workbook_root)
+                if calc_pr.get("fullCalcOnLoad") not in ("1", "true"):
+                    calc_pr.set("fullCalcOnLoad", "1")
+                    patched[workbook_part] = write_xml_part(workbook_root, workbook_ns)
+
+            # A formula cell that becomes a value leaves calcChain stale; with
+            # no_recalc it goes regardless and Excel rebuilds it when needed
+            drop_calc_chain = (had_formula or no_recalc) and ARC_CALC_CHAIN in zin.namelist()
+
+            with zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as zout:
+                for info in zin.infolist():
+                    name = info.filename
+                    if drop_calc_chain and name == ARC_CALC_CHAIN:
+                        continue
+                    if name in patched:
+                        data = patched[name]
+                    else:
+                        data = zin.read(info)
+                        if drop_calc_chain and name in (ARC_CONTENT_TYPES, get_rels_part(workbook_part)):
+                            data = drop_calc_chain_refs(name, data)
+                    zout.writestr(info, data)
+        written = True
+
+    return written
+
+
+def fast_set_cell(
+    filepath: Path,
+    sheet: str,
+    cell: str,
+    value: Any,
+    style: Optional[str] = None,
+    number_format: Optional[str] = None,
+    no_recalc: bool = False
+) -> bool:
+    """
+    In-place equivalent of ExcelAgent.set_cell_value() + save(). Returns
+    False, leaving the file untouched, if the cell already held value.
+    """
+    with FileLock(filepath):
+        return _patch_single_cell(
+            filepath, sheet, cell, value, style,
+            number_format=number_format, no_recalc=no_recalc, skip_unchanged=True
+        )
+
+
+def fast_add_assumption(
+    filepath: Path,
+    sheet: str,
+    cell: str,
+    value: Any,
+    description: str,
+    number_format: Optional[str] = None
+) -> None:
+    """In-place equivalent of ExcelAgent.add_assumption() + save()."""
+    with FileLock(filepath):
+        _patch_single_cell(
+            filepath, sheet, cell, value, STYLE_ASSUMPTION,
+            number_format=number_format, comment=description
+        )
+
+
+def fast_add_formula(
+    filepath: Path,
+    sheet: str,
+    cell: str,
+    formula: str,
+    validate_refs: bool = True,
+    allow_external: bool = False
+) -> None:
+    """In-place equivalent of ExcelAgent.add_formula() + save()."""
+    with FileLock(filepath):
+        with zipfile.ZipFile(filepath) as archive:
+            sheet_names = list(get_sheet_parts(archive))
+        formula = prepare_formula(formula, sheet_names, validate_refs, allow_external)
+        _patch_single_cell(filepath, sheet, cell, formula, STYLE_FORMULA)
+
+
+__all__ = [
+    "FastPatchUnsupported",
+    "fast_set_cell",
+    "fast_add_assumption",
+    "fast_add_formula",
+]
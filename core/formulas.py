@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Excel Formula Checks
+
+Security scanning and sheet-reference validation for formulas. Pure
+Python, so CLI tools can reject a formula before loading openpyxl.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from .exceptions import FormulaError, SecurityError
+
+
+MAX_FORMULA_LENGTH = 8000
+MAX_FORMULA_NESTING = 64
+
+
+_DANGEROUS_FORMULA_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), warning)
+    for pattern, warning in [
+        (r'WEBSERVICE\s*\(', 'WEBSERVICE function (network access)'),
+        (r'HYPERLINK\s*\(', 'HYPERLINK function (potential phishing)'),
+        (r'CALL\s*\(', 'CALL function (external DLL execution)'),
+        (r'\[[\w\s]+\.xl', 'External workbook reference'),
+        (r'INDIRECT\s*\(.*HYPERLINK', 'INDIRECT+HYPERLINK combination (security risk)'),
+    ]
+]
+
+_QUOTED_SHEET_REF = re.compile(r"'([^']+)'!")
+_PLAIN_SHEET_REF = re.compile(r"([A-Za-z0-9_]+)!")
+
+
+def sanitize_formula(formula: str, allow_external: bool = False) -> Tuple[str, List[str]]:
+    """
+    Sanitize formula for security issues.
+    
+    Returns:
+        Tuple of (sanitized_formula, list_of_warnings)
+    """
+    warnings = []
+    
+    # Ensure formula starts with =
+    if not formula.startswith('='):
+        formula = '=' + formula
+    
+    # Check for dangerous functions
+    for pattern, warning in _DANGEROUS_FORMULA_PATTERNS:
+        if pattern.search(formula):
+            warnings.append(warning)
+    
+    # Check formula length
+    if len(formula) > MAX_FORMULA_LENGTH:
+        warnings.append(f'Formula exceeds recommended length ({len(formula)} chars)')
+    
+    # Check nesting depth
+    nesting = formula.count('(') - formula.count(')')
+    if abs(nesting) > MAX_FORMULA_NESTING:
+        warnings.append(f'Formula nesting depth suspicious ({nesting})')
+    
+    return formula, warnings
+
+
+def scan_formula_security(formula: str, allow_external: bool = False) -> str:
+    """
+    Reject formulas using dangerous functions or external references.
+    
+    Needs no workbook, so tools can run it before opening the file.
+    Returns the formula with a leading '='; raises SecurityError.
+    """
+    formula, warnings = sanitize_formula(formula, allow_external)
+    
+    if warnings and not allow_external:
+        raise SecurityError(
+            f"Formula contains potentially unsafe operations: {'; '.join(warnings)}"
+        )
+    
+    return formula
+
+
+def validate_formula_references(formula: str, existing_sheets: List[str]) -> Tuple[bool, Optional[str]]:
+    """Validate all sheet references in formula exist."""
+    if not formula or not isinstance(formula, str):
+        return False, "Formula must be a non-empty string"
+    
+    # Extract sheet names from references (e.g., 'Sheet1'!A1 or Sheet1!A1)
+    sheet_refs = _QUOTED_SHEET_REF.findall(formula)
+    sheet_refs.extend(_PLAIN_SHEET_REF.findall(formula))
+    sheet_refs = list(set(sheet_refs))  # Remove duplicates
+    
+    for sheet_ref in sheet_refs:
+        if sheet_ref not in existing_sheets:
+            return False, f"Referenced sheet '{sheet_ref}' does not exist"
+    
+    return True, None
+
+
+def prepare_formula(
+    formula: str,
+    sheet_names: List[str],
+    validate_refs: bool = True,
+    allow_external: bool = False
+) -> str:
+    """
+    Sanitize a formula and enforce the security and reference checks.
+    
+    Returns the formula with a leading '='; raises SecurityError or
+    FormulaError if it must not be written.
+    """
+    formula = scan_formula_security(formula, allow_external)
+    
+    # Validate references
+    if validate_refs:
+        is_valid, error = validate_formula_references(formula, sheet_names)
+        if not is_valid:
+            raise FormulaError(f"Invalid reference: {error}")
+    
+    return formula
+
+
+__all__ = [
+    "MAX_FORMULA_LENGTH",
+    "MAX_FORMULA_NESTING",
+    "sanitize_formula",
+    "scan_formula_security",
+    "validate_formula_references",
+    "prepare_formula",
+]
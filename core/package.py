@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Excel Package Access
+
+Helpers for tools that read or patch the .xlsx zip package directly
+instead of round-tripping the whole workbook through openpyxl. Only the
+standard library is used, so these work before openpyxl is imported.
+"""
+
+import io
+import mmap
+import os
+import posixpath
+import shutil
+import struct
+import tempfile
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+ARC_CONTENT_TYPES = "[Content_Types].xml"
+ARC_CALC_CHAIN = "xl/calcChain.xml"
+
+# zipfile emits many small writes; batch them into few large ones
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _resolve_part(source_part: str, target: str) -> str:
+    """Resolve a relationship target relative to the part that owns it."""
+    if target.startswith('/'):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+
+def get_rels_part(part: str) -> str:
+    """Return the relationships part name for a package part."""
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, "_rels", f"{name}.rels")
+
+
+def read_rels(archive: zipfile.ZipFile, part: str) -> Dict[str, Tuple[str, str]]:
+    """Read relationships of a part as {rId: (type, resolved_target)}."""
+    try:
+        root = ET.fromstring(archive.read(get_rels_part(part)))
+    except KeyError:
+        return {}
+    
+    rels = {}
+    for rel in root.iter(f"{{{NS_PKG_REL}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        rels[rel.get("Id")] = (rel.get("Type", ""), _resolve_part(part, rel.get("Target", "")))
+    return rels
+
+
+def get_workbook_part(archive: zipfile.ZipFile) -> str:
+    """Locate the main workbook part via the package root relationships."""
+    for rel_type, target in read_rels(archive, "").values():
+        if rel_type.endswith("/officeDocument"):
+            return target
+    return "xl/workbook.xml"
+
+
+def get_sheet_parts(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """
+    Map sheet names to their part names (e.g. 'xl/worksheets/sheet1.xml').
+    
+    Order follows the workbook's sheet order.
+    """
+    workbook_part = get_workbook_part(archive)
+    rels = read_rels(archive, workbook_part)
+    
+    parts = {}
+    rid_attr = f"{{{NS_DOC_REL}}}id"
+    with archive.open(workbook_part) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag == f"{{{NS_MAIN}}}sheet":
+                rel = rels.get(elem.get(rid_attr))
+                if rel:
+                    parts[elem.get("name")] = rel[1]
+            elif elem.tag == f"{{{NS_MAIN}}}sheets":
+                break
+    return parts
+
+
+def read_xml_part(data: bytes) -> Tuple[ET.Element, List[Tuple[str, str]]]:
+    """Parse an XML part, returning the root and its namespace declarations."""
+    namespaces = []
+    root = None
+    for event, item in ET.iterparse(io.BytesIO(data), events=("start-ns", "start")):
+        if event == "start-ns":
+            namespaces.append(item)
+        elif root is None:
+            root = item
+    # iterparse is done once the generator is exhausted; root is fully built
+    return root, namespaces
+
+
+def write_xml_part(root: ET.Element, namespaces: List[Tuple[str, str]]) -> bytes:
+    """
+    Serialize an XML part, keeping the original namespace prefixes.
+    
+    ElementTree drops declarations that no element uses, but Excel parts
+    reference prefixes from mc:Ignorable, so missing ones are re-added.
+    """
+    for prefix, uri in namespaces:
+        try:
+            ET.register_namespace(prefix, uri)
+        except ValueError:
+            pass  # reserved ns0-style prefix; ElementTree picks its own
+    
+    data = ET.tostring(root, encoding="UTF-8", xml_declaration=True)
+    
+    tag_start = data.index(b"<", data.index(b"?>"))
+    tag_end = data.index(b">", tag_start)
+    root_tag = data[tag_start:tag_end]
+    missing = b"".join(
+        b' xmlns:%s="%s"' % (prefix.encode(), uri.encode())
+        for prefix, uri in namespaces
+        if prefix and b" xmlns:%s=" % prefix.encode() not in root_tag
+    )
+    if missing:
+        if root_tag.endswith(b"/"):
+            tag_end -= 1
+        data = data[:tag_end] + missing + data[tag_end:]
+    return data
+
+
+# CT_Workbook children that must come after <calcPr>
+_AFTER_CALC_PR = {
+    "oleSize", "customWorkbookViews", "pivotCaches", "smartTagPr", "smartTagTypes",
+    "webPublishing", "fileRecoveryPr", "webPublishObjects", "extLst",
+}
+
+
+def get_calc_pr(workbook_root: ET.Element) -> ET.Element:
+    """Return the workbook's <calcPr>, inserting it in schema order if missing."""
+    tag = f"{{{NS_MAIN}}}calcPr"
+    calc_pr = workbook_root.find(tag)
+    if calc_pr is None:
+        calc_pr = ET.Element(tag)
+        pos = next(
+            (i for i, child in enumerate(workbook_root)
+             if child.tag.rpartition("}")[2] in _AFTER_CALC_PR),
+            len(workbook_root)
+        )
+        workbook_root.insert(pos, calc_pr)
+    return calc_pr
+
+
+def set_manual_calc(workbook_root: ET.Element) -> None:
+    """Switch the workbook to manual calculation with no recalc on load."""
+    calc_pr = get_calc_pr(workbook_root)
+    calc_pr.set("calcMode", "manual")
+    calc_pr.attrib.pop("fullCalcOnLoad", None)
+
+
+def drop_part_refs(part: str, data: bytes, target: str, rel_type: str) -> bytes:
+    """
+    Remove references to the package part target from the content types
+    or workbook relationships part, matching relationships by the end of
+    their Type (e.g. '/calcChain').
+    """
+    root, namespaces = read_xml_part(data)
+    
+    if part == ARC_CONTENT_TYPES:
+        refs = [
+            elem for elem in root.iter(f"{{{NS_CONTENT_TYPES}}}Override")
+            if elem.get("PartName") == f"/{target}"
+        ]
+    else:
+        refs = [
+            elem for elem in root.iter(f"{{{NS_PKG_REL}}}Relationship")
+            if elem.get("Type", "").endswith(rel_type)
+        ]
+    
+    if not refs:
+        return data
+    for elem in refs:
+        root.remove(elem)
+    return write_xml_part(root, namespaces)
+
+
+def drop_calc_chain_refs(part: str, data: bytes) -> bytes:
+    """
+    Remove references to xl/calcChain.xml from the content types or
+    workbook relationships part.
+    
+    A stale calculation chain makes Excel report the file as corrupt, so
+    it must go whenever formulas are removed from the package.
+    """
+    return drop_part_refs(part, data, ARC_CALC_CHAIN, "/calcChain")
+
+
+class NothingToWrite(Exception):
+    """Raised inside atomic_write() to leave target untouched, without error."""
+
+
+@contextmanager
+def atomic_write(target: Path, buffering: int = WRITE_BUFFER_SIZE):
+    """
+    Open a temporary file beside target for binary writing and move it
+    into place only if the block succeeds.
+    
+    Anything read from target must be closed inside the block: Windows
+    cannot replace a file that is still open (or memory-mapped). A block
+    that finds there is nothing to save raises NothingToWrite, which
+    discards the temporary file and is not propagated.
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+    )
+    try:
+        with os.fdopen(fd, "wb", buffering=buffering) as f:
+            yield f
+        if target.exists():
+            shutil.copymode(target, tmp_name)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_name, 0o666 & ~umask)
+        os.replace(tmp_name, target)
+    except BaseException as e:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        if not isinstance(e, NothingToWrite):
+            raise
+
+
+class _MappedFile(mmap.mmap):
+    """mmap with the seekable() that zipfile expects (built in from 3.13)."""
+    
+    def seekable(self) -> bool:
+        return True
+
+
+@contextmanager
+def open_package(filepath: Path):
+    """
+    Open an .xlsx package for reading through a read-only memory map.
+    
+    Member reads then come straight from the page cache instead of going
+    through a second layer of Python file buffering. Files that cannot be
+    mapped (empty, special files) are read normally.
+    """
+    with open(filepath, "rb") as f:
+        try:
+            mapped = _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            mapped = None
+        try:
+            with zipfile.ZipFile(mapped if mapped is not None else f) as archive:
+                yield archive
+        finally:
+            if mapped is not None:
+                mapped.close()
+
+
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def read_member(archive: zipfile.ZipFile, name: str) -> bytes:
+    """
+    Read one package member. For an archive from open_package() the
+    compressed bytes are decompressed in a single call straight out of the
+    memory map, skipping ZipExtFile's chunked reads and copies; anything
+    else (or an encrypted or unusually compressed member) uses
+    ZipFile.read().
+    """
+    info = archive.getinfo(name)
+    mapped = archive.fp
+    if (not isinstance(mapped, mmap.mmap) or info.flag_bits & 0x1
+            or info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)):
+        return archive.read(info)
+    
+    offset = info.header_offset
+    header = _LOCAL_HEADER.unpack_from(mapped, offset)
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local file header for {name}")
+    start = offset + _LOCAL_HEADER.size + header[-2] + header[-1]
+    
+    with memoryview(mapped)[start:start + info.compress_size] as raw:
+        if info.compress_type == zipfile.ZIP_STORED:
+            data = bytes(raw)
+        else:
+            data = zlib.decompress(raw, -zlib.MAX_WBITS, info.file_size or zlib.DEF_BUF_SIZE)
+    
+    if zlib.crc32(data) != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for {name}")
+    return data
+
+
+def list_sheet_names(filepath: Path) -> Optional[List[str]]:
+    """
+    Sheet names in workbook order, read from the workbook part alone.
+    
+    Returns None for packages that cannot be read this way, leaving the
+    caller's regular openpyxl load to raise the real error.
+    """
+    names = []
+    try:
+        with zipfile.ZipFile(filepath) as archive:
+            with archive.open(get_workbook_part(archive)) as f:
+                for _, elem in ET.iterparse(f):
+                    if elem.tag == f"{{{NS_MAIN}}}sheet":
+                        names.append(elem.get("name"))
+                    elif elem.tag == f"{{{NS_MAIN}}}sheets":
+                        break
+    except (zipfile.BadZipFile, KeyError, ET.ParseError):
+        return None
+    return names
+
+
+def sheet_exists(filepath: Path, sheet_name: str) -> bool:
+    """
+    Check for a sheet by reading only the workbook part's <sheet> names.
+    
+    Packages that cannot be read this way report True.
+    """
+    names = list_sheet_names(filepath)
+    return names is None or sheet_name in names
+
+
+__all__ = [
+    "NS_MAIN",
+    "NS_DOC_REL",
+    "NS_PKG_REL",
+    "NS_CONTENT_TYPES",
+    "ARC_CONTENT_TYPES",
+    "ARC_CALC_CHAIN",
+    "WRITE_BUFFER_SIZE",
+    "get_workbook_part",
+    "get_rels_part",
+    "read_rels",
+    "get_sheet_parts",
+    "list_sheet_names",
+    "sheet_exists",
+    "read_xml_part",
+    "write_xml_part",
+    "get_calc_pr",
+    "set_manual_calc",
+    "drop_part_refs",
+    "drop_calc_chain_refs",
+    "NothingToWrite",
+    "atomic_write",
+    "open_package",
+    "read_member",
+]
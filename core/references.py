@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Excel Reference Helpers
+
+Pure-Python validation of cell, range and sheet names. Kept free of
+openpyxl so CLI tools can validate arguments before loading it.
+"""
+
+from functools import lru_cache
+from string import ascii_letters
+from typing import Optional, Tuple
+
+try:
+    from ._a1 import decode as _decode_a1
+except ImportError:  # optional compiled fast path, see core/_a1.pyx
+    _decode_a1 = None
+
+
+def split_cell_reference(ref: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a cell reference into (column letters, row digits), or None.
+    
+    Accepts 1-3 ASCII letters followed by 1-7 ASCII digits, the same shape
+    as '^[A-Z]{1,3}\\d{1,7}$' on the upper-cased reference, with a plain
+    string scan instead of the regex engine.
+    """
+    if not isinstance(ref, str):
+        return None
+    return _split_cell_reference(ref)
+
+
+# Batch and daemon callers validate the same few cells over and over
+@lru_cache(maxsize=1024)
+def _split_cell_reference(ref: str) -> Optional[Tuple[str, str]]:
+    if not 2 <= len(ref) <= 10 or not ref.isascii():
+        return None
+    n_letters = len(ref) - len(ref.lstrip(ascii_letters))
+    digits = ref[n_letters:]
+    if not 1 <= n_letters <= 3 or not 1 <= len(digits) <= 7 or not digits.isdigit():
+        return None
+    return ref[:n_letters].upper(), digits
+
+
+def _decode_cell_reference(ref: str) -> Optional[Tuple[int, int]]:
+    # Pure-Python twin of core._a1.decode
+    parts = split_cell_reference(ref)
+    if parts is None:
+        return None
+    letters, digits = parts
+    col = 0
+    for letter in letters:
+        col = col * 26 + ord(letter) - 64
+    return int(digits), col
+
+
+if _decode_a1 is not None:
+    def decode_cell_reference(ref: str) -> Optional[Tuple[int, int]]:
+        """Decode a cell reference to (row, column), 1-indexed, or None."""
+        if not isinstance(ref, str):
+            return None
+        return _decode_a1(ref)
+    
+    def is_valid_cell_reference(ref: str) -> bool:
+        """Validates Excel cell reference format (e.g., 'A1', 'BZ5000')."""
+        return isinstance(ref, str) and _decode_a1(ref) is not None
+else:
+    def decode_cell_reference(ref: str) -> Optional[Tuple[int, int]]:
+        """Decode a cell reference to (row, column), 1-indexed, or None."""
+        return _decode_cell_reference(ref)
+    
+    def is_valid_cell_reference(ref: str) -> bool:
+        """Validates Excel cell reference format (e.g., 'A1', 'BZ5000')."""
+        return split_cell_reference(ref) is not None
+
+
+def is_valid_range_reference(range_ref: str) -> bool:
+    """Validates Excel range reference format (e.g., 'A1:B10')."""
+    if not range_ref:
+        return False
+    
+    # Handle sheet-qualified references
+    if "!" in range_ref:
+        parts = range_ref.split("!")
+        if len(parts) != 2:
+            return False
+        range_ref = parts[1]
+    
+    if ":" not in range_ref:
+        return is_valid_cell_reference(range_ref)
+    
+    parts = range_ref.split(":")
+    if len(parts) != 2:
+        return False
+    
+    return is_valid_cell_reference(parts[0]) and is_valid_cell_reference(parts[1])
+
+
+def parse_range(range_ref: str) -> Tuple[str, str]:
+    """Parse range reference into start and end cells."""
+    if "!" in range_ref:
+        _, range_ref = range_ref.split("!", 1)
+    
+    if ":" not in range_ref:
+        return range_ref, range_ref
+    
+    start, end = range_ref.split(":", 1)
+    return start, end
+
+
+def is_valid_sheet_name(name: str) -> bool:
+    """Validate Excel sheet name."""
+    if not name or len(name) > 31:
+        return False
+    invalid_chars = [':', '\\', '/', '?', '*', '[', ']']
+    return not any(char in name for char in invalid_chars)
+
+
+def sanitize_sheet_name(name: str) -> str:
+    """Sanitize sheet name by removing invalid characters."""
+    if not name:
+        return "Sheet1"
+    
+    # Remove invalid characters
+    for char in [':', '\\', '/', '?', '*', '[', ']']:
+        name = name.replace(char, '_')
+    
+    # Truncate to 31 chars
+    name = name[:31]
+    
+    return name or "Sheet1"
+
+
+__all__ = [
+    "split_cell_reference",
+    "decode_cell_reference",
+    "is_valid_cell_reference",
+    "is_valid_range_reference",
+    "parse_range",
+    "is_valid_sheet_name",
+    "sanitize_sheet_name",
+]
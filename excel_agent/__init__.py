@@ -0,0 +1,20 @@
+"""
+Excel Agent Tool.
+
+Installed, this package holds excel_agent.core (the library) and
+excel_agent.tools (one command per module; see TOOLS_REFERENCE.md). In a
+checkout those are ./core and ./tools, next to this directory, and are
+found through the package path set up below.
+
+A tool run as a plain script (`python tools/excel_x.py`) has no package,
+so it first puts the checkout root on sys.path; that is what the
+`if not __package__` guard at the top of every tool is for. Installed
+entry points and `python -m` runs resolve excel_agent on their own.
+"""
+
+import os
+
+_here = os.path.dirname(os.path.abspath(__file__))
+if not os.path.isdir(os.path.join(_here, "core")):
+    # A checkout: core/ and tools/ sit beside this directory
+    __path__.append(os.path.dirname(_here))
@@ -0,0 +1,23 @@
+"""
+Optional compiled extensions; project metadata lives in pyproject.toml.
+
+excel_agent.core._a1 speeds up A1 reference decoding (core/references.py).
+It is built when Cython is installed and skipped otherwise, and a failed
+compile is not fatal: core/references.py falls back to pure Python.
+
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [Extension("excel_agent.core._a1", ["core/_a1.pyx"], optional=True)],
+        language_level=3,
+    )
+
+setup(ext_modules=ext_modules)
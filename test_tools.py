@@ -78,6 +78,103 @@ def temp_dir():
     shutil.rmtree(temp_path, ignore_errors=True)
 
 
+SHARED_STRINGS_PARTS = {
+    '[Content_Types].xml': (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+    'xl/sharedStrings.xml': (
+        '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="2" uniqueCount="2">'
+        '<si><t>SECRET CLIENT NAME</t></si><si><t>Region, "North"</t></si></sst>'
+    ),
+    'xl/worksheets/sheet1.xml': (
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="inlineStr"><is><t>Inline</t></is></c>'
+        '<c r="C1" t="b"><v>1</v></c><c r="D1" t="s"><v>1</v></c></row>'
+        '<row r="2"><c r="A2"><v>42</v></c><c r="B2" s="1"><v>45000</v></c>'
+        '<c r="C2"><f>A2*2</f><v>84</v></c><c r="D2" t="str"><f>A1&amp;"!"</f><v>SECRET CLIENT NAME!</v></c></row>'
+        '<row r="3"><c r="A3"><v>0.125</v></c><c r="C3" t="b"><v>0</v></c></row>'
+        '</sheetData></worksheet>'
+    ),
+}
+
+
+@pytest.fixture
+def shared_strings_file(temp_dir):
+    """Workbook as Excel writes it: shared strings plus inline, date, bool and formula cells."""
+    import zipfile
+
+    filepath = temp_dir / 'shared.xlsx'
+    with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, xml in SHARED_STRINGS_PARTS.items():
+            zf.writestr(name, xml)
+    return filepath
+
+
+@pytest.fixture
+def calc_chain_file(temp_dir):
+    """The shared strings workbook plus a calcChain and full recalc on load."""
+    import zipfile
+
+    parts = dict(SHARED_STRINGS_PARTS)
+    parts['[Content_Types].xml'] = parts['[Content_Types].xml'].replace('</Types>', (
+        '<Override PartName="/xl/calcChain.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.calcChain+xml"/>'
+        '</Types>'
+    ))
+    parts['xl/_rels/workbook.xml.rels'] = parts['xl/_rels/workbook.xml.rels'].replace('</Relationships>', (
+        '<Relationship Id="rId4" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/calcChain" Target="calcChain.xml"/>'
+        '</Relationships>'
+    ))
+    parts['xl/workbook.xml'] = parts['xl/workbook.xml'].replace(
+        '</sheets>', '</sheets><calcPr calcId="191029" fullCalcOnLoad="1"/>'
+    )
+    parts['xl/calcChain.xml'] = (
+        '<calcChain xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<c r="C2" i="1"/><c r="D2"/></calcChain>'
+    )
+
+    filepath = temp_dir / 'calc.xlsx'
+    with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, xml in parts.items():
+            zf.writestr(name, xml)
+    return filepath
+
+
 # ============================================================================
 # CREATION TOOLS TESTS
 # ============================================================================
@@ -99,7 +196,50 @@ class TestCreationTools:
         assert output.exists()
         assert result['data']['sheet_count'] == 3
         assert 'Sheet1' in result['data']['sheets']
-    
+
+    def test_create_new_skeleton_package(self, runner, temp_dir):
+        """Test the written package names its creator and needs no theme."""
+        import zipfile
+        from openpyxl import load_workbook
+
+        output = temp_dir / 'test.xlsx'
+        runner.run('excel_create_new.py', {'output': output, 'sheets': 'Data'})
+
+        with zipfile.ZipFile(output) as zf:
+            assert not any(b'theme' in zf.read(name) for name in zf.namelist())
+        assert load_workbook(output).properties.creator == 'Excel Agent Tool'
+
+    def test_create_new_duplicate_names_ignore_case(self, runner, temp_dir):
+        """Test sheet names differing only in case are duplicates."""
+        output = temp_dir / 'test.xlsx'
+
+        for write_only in (True, False):
+            result = runner.run('excel_create_new.py', {
+                'output': output,
+                'sheets': 'Data,data',
+                'no-write-only': not write_only
+            })
+
+            assert result['returncode'] == 1
+            assert 'Duplicate sheet names' in result['data']['error']
+            assert not output.exists()
+
+    def test_create_new_special_sheet_names(self, runner, temp_dir):
+        """Test sheet names needing XML escaping round-trip."""
+        from openpyxl import load_workbook
+
+        output = temp_dir / 'test.xlsx'
+
+        result = runner.run('excel_create_new.py', {
+            'output': output,
+            'sheets': 'P&L,Q "1",<Notes>'
+        })
+
+        assert result['returncode'] == 0
+        wb = load_workbook(output)
+        assert wb.sheetnames == ['P&L', 'Q "1"', '<Notes>']
+        assert 'FinancialAssumption' in wb.named_styles
+
     def test_create_new_invalid_sheet_names(self, runner, temp_dir):
         """Test creation with invalid sheet names."""
         output = temp_dir / 'test.xlsx'
@@ -127,7 +267,20 @@ class TestCreationTools:
         assert result['returncode'] == 0
         assert result['data']['status'] == 'dry_run'
         assert not output.exists()
-    
+
+    def test_create_new_control_character_fallback(self, runner, temp_dir):
+        """Test sheet names the XML skeleton cannot write go through openpyxl."""
+        from openpyxl import load_workbook
+
+        output = temp_dir / 'test.xlsx'
+        result = runner.run('excel_create_new.py', {
+            'output': output,
+            'sheets': 'Q1\tActuals,Plan'
+        })
+
+        assert result['returncode'] == 0
+        assert load_workbook(output).sheetnames == ['Q1\tActuals', 'Plan']
+
     def test_create_from_structure_basic(self, runner, temp_dir):
         """Test creation from structure."""
         output = temp_dir / 'model.xlsx'
@@ -210,6 +363,65 @@ class TestCreationTools:
         assert result['data']['status'] == 'success'
         assert output.exists()
 
+    def test_clone_template_preserve_formulas(self, runner, temp_dir):
+        """Test cloning keeps formulas while clearing values."""
+        source = temp_dir / 'source.xlsx'
+        structure_file = temp_dir / 'structure.json'
+        structure_file.write_text(json.dumps({
+            "sheets": ["Sheet1"],
+            "cells": [
+                {"sheet": "Sheet1", "cell": "A1", "value": 10},
+                {"sheet": "Sheet1", "cell": "B1", "formula": "=A1*2"}
+            ]
+        }))
+        runner.run('excel_create_from_structure.py', {
+            'output': source,
+            'structure': structure_file
+        })
+
+        output = temp_dir / 'clone.xlsx'
+        result = runner.run('excel_clone_template.py', {
+            'source': source,
+            'output': output,
+            'preserve-formulas': True
+        })
+
+        assert result['returncode'] == 0
+        assert result['data']['sheets'] == ['Sheet1']
+
+        value = runner.run('excel_get_value.py', {
+            'file': output, 'sheet': 'Sheet1', 'cell': 'A1'
+        })
+        formula = runner.run('excel_get_value.py', {
+            'file': output, 'sheet': 'Sheet1', 'cell': 'B1', 'get-both': True
+        })
+        assert value['data']['value'] is None
+        assert formula['data']['formula'] == '=A1*2'
+
+    def test_clone_template_drops_shared_strings(self, runner, shared_strings_file, temp_dir):
+        """Test cleared values leave no text behind in any package part."""
+        import zipfile
+
+        output = temp_dir / 'clone.xlsx'
+        result = runner.run('excel_clone_template.py', {
+            'source': shared_strings_file,
+            'output': output,
+            'preserve-formulas': True,
+            'preserve-formatting': True
+        })
+
+        assert result['returncode'] == 0
+        with zipfile.ZipFile(output) as zf:
+            assert 'xl/sharedStrings.xml' not in zf.namelist()
+            for name in zf.namelist():
+                assert b'SECRET CLIENT NAME' not in zf.read(name), name
+                assert b'sharedStrings' not in zf.read(name), name
+
+        formula = runner.run('excel_get_value.py', {
+            'file': output, 'sheet': 'Data', 'cell': 'C2', 'get-both': True
+        })
+        assert formula['data']['formula'] == '=A2*2'
+
 
 # ============================================================================
 # CELL OPERATIONS TESTS
@@ -254,7 +466,305 @@ class TestCellOperations:
         
         assert result['returncode'] == 0
         assert result['data']['type'] == 'float'
-    
+
+    def test_set_value_fast_patch(self, runner, sample_file):
+        """Test plain values are patched in place, keeping the cell style."""
+        from openpyxl import load_workbook
+
+        runner.run('excel_add_financial_input.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'C3',
+            'value': 100
+        })
+        text = runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'B2',
+            'value': '  padded ',
+            'type': 'string'
+        })
+        number = runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'C3',
+            'value': '250'
+        })
+
+        assert text['data']['fast_patch'] is True
+        assert number['data']['fast_patch'] is True
+        ws = load_workbook(sample_file)['Sheet1']
+        assert ws['B2'].value == '  padded '
+        assert ws['C3'].value == 250
+        assert ws['C3'].style == 'FinancialInput'
+
+    def test_set_value_noop(self, runner, sample_file):
+        """Test repeating an edit leaves the file untouched."""
+        args = {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'D4',
+            'value': '42'
+        }
+        first = runner.run('excel_set_value.py', args)
+        mtime = sample_file.stat().st_mtime_ns
+        second = runner.run('excel_set_value.py', args)
+
+        assert first['data']['noop'] is False
+        assert second['returncode'] == 0
+        assert second['data']['noop'] is True
+        assert sample_file.stat().st_mtime_ns == mtime
+
+    def test_set_value_noop_with_format(self, runner, sample_file):
+        """Test the openpyxl path skips the save for a repeated formatted edit."""
+        args = {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'B3',
+            'value': '0.5',
+            'format': '0.00%'
+        }
+        first = runner.run('excel_set_value.py', args)
+        mtime = sample_file.stat().st_mtime_ns
+        second = runner.run('excel_set_value.py', args)
+
+        assert first['data']['noop'] is False
+        assert second['returncode'] == 0
+        assert second['data']['noop'] is True
+        assert second['data']['fast_patch'] is False
+        assert sample_file.stat().st_mtime_ns == mtime
+
+    def test_set_value_noop_shared_string(self, runner, shared_strings_file):
+        """Test the fast patch spots a shared string that is already there."""
+        mtime = shared_strings_file.stat().st_mtime_ns
+        result = runner.run('excel_set_value.py', {
+            'file': shared_strings_file,
+            'sheet': 'Data',
+            'cell': 'D1',
+            'value': 'Region, "North"',
+            'type': 'string'
+        })
+
+        assert result['returncode'] == 0
+        assert result['data']['noop'] is True
+        assert shared_strings_file.stat().st_mtime_ns == mtime
+
+    def test_set_value_unknown_sheet(self, runner, sample_file):
+        """Test a missing sheet is reported with the available names."""
+        result = runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'sheet': 'Sheet2',
+            'cell': 'A1',
+            'value': '1'
+        })
+
+        assert result['returncode'] == 1
+        assert "Available: ['Sheet1', 'Assumptions']" in result['data']['error']
+
+    def test_set_value_xlsb_read_only(self, runner, temp_dir):
+        """Test .xlsb edits are refused with a pointer to .xlsx."""
+        binary = temp_dir / 'model.xlsb'
+        binary.write_bytes(b'PK\x03\x04')
+
+        result = runner.run('excel_set_value.py', {
+            'file': binary,
+            'sheet': 'Sheet1',
+            'cell': 'A1',
+            'value': '1'
+        })
+
+        assert result['returncode'] == 1
+        assert result['data']['error_type'] == 'ValidationError'
+        assert '.xlsx' in result['data']['error']
+        assert binary.read_bytes() == b'PK\x03\x04'
+
+    def test_set_value_dry_run(self, runner, sample_file):
+        """Test dry run reports the edit without writing."""
+        mtime = sample_file.stat().st_mtime_ns
+        result = runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'A1',
+            'value': '7',
+            'dry-run': True
+        })
+
+        assert result['returncode'] == 0
+        assert result['data']['status'] == 'dry_run'
+        assert result['data']['noop'] is False
+        assert sample_file.stat().st_mtime_ns == mtime
+
+    def test_set_value_stdin_to_stdout(self, tools_dir, sample_file, temp_dir):
+        """Test piping a workbook through --file - and --stdout-xlsx."""
+        from openpyxl import load_workbook
+
+        with open(sample_file, 'rb') as f:
+            result = subprocess.run(
+                ['python', str(tools_dir / 'excel_set_value.py'), '--file', '-',
+                 '--sheet', 'Sheet1', '--cell', 'B2', '--value', '12',
+                 '--stdout-xlsx', '--json'],
+                stdin=f,
+                capture_output=True,
+                cwd=tools_dir.parent
+            )
+
+        assert result.returncode == 0
+        assert json.loads(result.stderr)['status'] == 'success'
+
+        output = temp_dir / 'piped.xlsx'
+        output.write_bytes(result.stdout)
+        assert load_workbook(output)['Sheet1']['B2'].value == 12
+
+    def test_set_value_batch(self, runner, sample_file, temp_dir):
+        """Test applying JSON-line edits with a single save."""
+        from openpyxl import load_workbook
+
+        edits = temp_dir / 'edits.jsonl'
+        edits.write_text(
+            '{"sheet": "Sheet1", "cell": "A1", "value": "Revenue"}\n'
+            '{"sheet": "Sheet1", "cell": "B1", "value": "0.25", "type": "number"}\n'
+            '{"sheet": "Assumptions", "cell": "A2", "value": 3}\n'
+        )
+        result = runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'batch': edits
+        })
+
+        assert result['returncode'] == 0
+        assert result['data']['edits'] == 3
+        wb = load_workbook(sample_file)
+        assert wb['Sheet1']['A1'].value == 'Revenue'
+        assert wb['Sheet1']['B1'].value == 0.25
+        assert wb['Assumptions']['A2'].value == 3
+
+        edits.write_text('{"sheet": "Missing", "cell": "A1", "value": 1}\n')
+        result = runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'batch': edits
+        })
+        assert result['returncode'] == 1
+
+    def test_set_value_daemon(self, tools_dir, sample_file, temp_dir):
+        """Test daemon edits and reopening a workbook rewritten on disk."""
+        import socket
+        import time
+        from openpyxl import load_workbook
+
+        sock_path = temp_dir / 'agent.sock'
+        daemon = subprocess.Popen(
+            ['python', str(tools_dir / 'excel_set_value.py'), '--daemon',
+             '--socket', str(sock_path), '--flush-every', '100', '--json'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=tools_dir.parent
+        )
+        try:
+            for _ in range(100):
+                if sock_path.exists():
+                    break
+                time.sleep(0.05)
+
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(str(sock_path))
+            replies = client.makefile('rb')
+
+            def send(**request):
+                request.setdefault('file', str(sample_file))
+                client.sendall(json.dumps(request).encode() + b'\n')
+                return json.loads(replies.readline())
+
+            assert send(sheet='Sheet1', cell='A1', value='Revenue')['status'] == 'success'
+            assert send(sheet='Sheet1', cell='B1', value=7)['status'] == 'success'
+            assert send(op='flush')['saved']
+            wb = load_workbook(sample_file)
+            assert wb['Sheet1']['A1'].value == 'Revenue'
+            assert wb['Sheet1']['B1'].value == 7
+
+            # A second daemon must not take over the live socket
+            second = subprocess.run(
+                ['python', str(tools_dir / 'excel_set_value.py'), '--daemon',
+                 '--socket', str(sock_path), '--json'],
+                capture_output=True,
+                text=True,
+                timeout=30,
+                cwd=tools_dir.parent
+            )
+            assert second.returncode == 1
+            assert 'already serving' in json.loads(second.stdout)['error']
+            assert send(op='flush')['status'] == 'success'
+
+            # Rewritten behind the daemon's back: the cached copy is stale
+            wb['Sheet1']['C1'] = 'external'
+            wb.save(sample_file)
+            assert send(sheet='Sheet1', cell='D1', value=1)['status'] == 'success'
+            assert send(op='flush')['saved']
+            wb = load_workbook(sample_file)
+            assert wb['Sheet1']['C1'].value == 'external'
+            assert wb['Sheet1']['D1'].value == 1
+
+            # Unsaved edits cannot be merged with an external write
+            assert send(sheet='Sheet1', cell='E1', value=2)['status'] == 'success'
+            wb['Sheet1']['F1'] = 'external'
+            wb.save(sample_file)
+            stale = send(sheet='Sheet1', cell='G1', value=3)
+            assert stale['status'] == 'error'
+            assert 'changed on disk' in stale['error']
+
+            assert send(op='shutdown')['shutdown'] is True
+            client.close()
+            assert daemon.wait(timeout=30) == 0
+        finally:
+            if daemon.poll() is None:
+                daemon.kill()
+            daemon.communicate()
+
+        wb = load_workbook(sample_file)
+        assert wb['Sheet1']['F1'].value == 'external'
+        assert wb['Sheet1']['E1'].value is None
+        assert not sock_path.exists()
+
+    def test_set_value_no_recalc(self, runner, tools_dir, calc_chain_file, temp_dir):
+        """Test --no-recalc sets manual calculation and drops calcChain."""
+        import re
+        import zipfile
+
+        edit = {'sheet': 'Data', 'cell': 'C2', 'value': '=A2*3', 'no-recalc': True}
+
+        fast = temp_dir / 'fast.xlsx'
+        shutil.copy(calc_chain_file, fast)
+        result = runner.run('excel_set_value.py', {'file': fast, **edit})
+        assert result['returncode'] == 0
+        assert result['data']['fast_patch'] is True
+
+        incremental = temp_dir / 'incremental.xlsx'
+        shutil.copy(calc_chain_file, incremental)
+        result = runner.run('excel_set_value.py', {'file': incremental, 'format': '0.00', **edit})
+        assert result['returncode'] == 0
+        assert result['data']['fast_patch'] is False
+
+        streamed = temp_dir / 'streamed.xlsx'
+        with open(calc_chain_file, 'rb') as f:
+            result = subprocess.run(
+                ['python', str(tools_dir / 'excel_set_value.py'), '--file', '-',
+                 '--sheet', 'Data', '--cell', 'C2', '--value', '=A2*3',
+                 '--no-recalc', '--stdout-xlsx', '--json'],
+                stdin=f,
+                capture_output=True,
+                cwd=tools_dir.parent
+            )
+        assert result.returncode == 0
+        streamed.write_bytes(result.stdout)
+
+        for path in (fast, incremental, streamed):
+            with zipfile.ZipFile(path) as zf:
+                workbook = zf.read('xl/workbook.xml').decode()
+                calc_pr = re.search(r'<(?:\w+:)?calcPr\b[^>]*>', workbook).group(0)
+                assert 'calcMode="manual"' in calc_pr, path.name
+                assert 'fullCalcOnLoad' not in calc_pr, path.name
+                assert 'xl/calcChain.xml' not in zf.namelist(), path.name
+                assert b'calcChain' not in zf.read('[Content_Types].xml'), path.name
+                assert b'calcChain' not in zf.read('xl/_rels/workbook.xml.rels'), path.name
+
     def test_add_formula_valid(self, runner, sample_file):
         """Test adding valid formula."""
         result = runner.run('excel_add_formula.py', {
@@ -333,7 +843,38 @@ class TestCellOperations:
         
         assert result['returncode'] == 0
         assert result['data']['status'] == 'success'
-    
+
+    def test_add_assumption_fast_patch(self, runner, sample_file):
+        """Test in-place patching once the sheet has the style and comments."""
+        from openpyxl import load_workbook
+
+        args = {
+            'file': sample_file,
+            'sheet': 'Assumptions',
+            'description': 'Revenue baseline',
+            'format': 'currency',
+            'fast-patch': True
+        }
+        # First edit registers the style and comments part via openpyxl
+        first = runner.run('excel_add_assumption.py', {**args, 'cell': 'B3', 'value': 100})
+        second = runner.run('excel_add_assumption.py', {**args, 'cell': 'B4', 'value': 200})
+        formula = runner.run('excel_add_formula.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'A1',
+            'formula': '=Assumptions!B3+Assumptions!B4',
+            'fast-patch': True
+        })
+
+        assert first['data']['fast_patch'] is False
+        assert second['data']['fast_patch'] is True
+        assert formula['returncode'] == 0
+        ws = load_workbook(sample_file)['Assumptions']
+        assert ws['B4'].value == 200
+        assert ws['B4'].style == 'FinancialAssumption'
+        assert ws['B4'].comment.text == 'Revenue baseline'
+        assert ws['B3'].number_format == ws['B4'].number_format
+
     def test_get_value(self, runner, sample_file):
         """Test reading cell value."""
         # First set a value
@@ -377,6 +918,116 @@ class TestCellOperations:
         assert result['data']['is_formula'] == True
         assert 'SUM' in result['data']['formula']
 
+    def test_save_keeps_unedited_sheet(self, runner, sample_file):
+        """Test that saving one sheet carries the other sheets over intact."""
+        runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'sheet': 'Assumptions',
+            'cell': 'A1',
+            'value': 'Growth Rate',
+            'type': 'string'
+        })
+
+        # Full save of Sheet1; Assumptions is copied from the file
+        result = runner.run('excel_format_range.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'range': 'A1:B2',
+            'format': 'percent'
+        })
+        assert result['returncode'] == 0
+
+        result = runner.run('excel_get_value.py', {
+            'file': sample_file,
+            'sheet': 'Assumptions',
+            'cell': 'A1'
+        })
+
+        assert result['returncode'] == 0
+        assert result['data']['value'] == 'Growth Rate'
+
+    def test_save_keeps_edits_made_on_wb(self, sample_file):
+        """Test a plain save() keeps edits made straight on agent.wb."""
+        from openpyxl import load_workbook
+        from excel_agent.core.excel_agent_core import ExcelAgent
+
+        wb = load_workbook(sample_file)
+        wb['Sheet1']['A1'] = 1
+        wb.save(sample_file)
+
+        with ExcelAgent.open_for_write(sample_file) as agent:
+            agent.wb['Sheet1']['A1'] = 999
+            agent.wb['Sheet1']['B2'] = 'new'
+            agent.save()
+
+        wb = load_workbook(sample_file)
+        assert wb['Sheet1']['A1'].value == 999
+        assert wb['Sheet1']['B2'].value == 'new'
+
+    def test_set_cell_value_reuses_style(self, sample_file):
+        """Test one named style and format over many cells adds a single xf."""
+        import re
+        import zipfile
+        from openpyxl import load_workbook
+        from excel_agent.core.excel_agent_core import ExcelAgent, STYLE_INPUT
+
+        def cell_xfs():
+            with zipfile.ZipFile(sample_file) as z:
+                styles = z.read('xl/styles.xml').decode('utf-8')
+            return int(re.search(r'<cellXfs count="(\d+)"', styles).group(1))
+
+        with ExcelAgent.open_for_write(sample_file) as agent:
+            agent.save()
+        before = cell_xfs()
+
+        with ExcelAgent.open_for_write(sample_file) as agent:
+            for row in range(1, 51):
+                agent.set_cell_value('Sheet1', f'C{row}', row, style=STYLE_INPUT, number_format='#,##0.00')
+            assert len(agent._style_cache) == 1
+            agent.save()
+        assert cell_xfs() == before + 1
+
+        # A reopened workbook starts with an empty cache and lands on the same xf
+        with ExcelAgent.open_for_write(sample_file) as agent:
+            assert not agent._style_cache
+            for row in range(1, 51):
+                agent.set_cell_value('Sheet1', f'D{row}', row, style=STYLE_INPUT, number_format='#,##0.00')
+            agent.save()
+        assert cell_xfs() == before + 1
+
+        ws = load_workbook(sample_file)['Sheet1']
+        assert {ws[f'{col}{row}'].style for col in 'CD' for row in range(1, 51)} == {STYLE_INPUT}
+        assert {ws[f'{col}{row}'].number_format for col in 'CD' for row in range(1, 51)} == {'#,##0.00'}
+
+    def test_in_place_saves_close_source_first(self, sample_file, monkeypatch):
+        """Test the source is closed and unmapped before it is replaced."""
+        import os
+        import excel_agent.core.package
+        from excel_agent.core.excel_agent_core import ExcelAgent
+        from excel_agent.core.fast_patch import fast_set_cell
+
+        if not os.path.isdir('/proc/self/fd'):
+            pytest.skip('needs /proc to list open files')
+
+        target = str(sample_file.resolve())
+        replaced = []
+        real_replace = os.replace
+
+        def checked_replace(src, dst):
+            fds = [os.path.realpath(f'/proc/self/fd/{fd}') for fd in os.listdir('/proc/self/fd')]
+            with open('/proc/self/maps') as maps:
+                assert target not in fds and target not in maps.read()
+            replaced.append(dst)
+            real_replace(src, dst)
+
+        monkeypatch.setattr(excel_agent.core.package.os, 'replace', checked_replace)
+
+        assert fast_set_cell(sample_file, 'Sheet1', 'A1', 5)
+        with ExcelAgent.open_for_write(sample_file) as agent:
+            agent.set_cell_value('Sheet1', 'A2', 6)
+            assert agent.save_incremental()
+        assert len(replaced) == 2
+
 
 # ============================================================================
 # RANGE OPERATIONS TESTS
@@ -495,6 +1146,126 @@ class TestSheetManagement:
         assert output.exists()
         assert result['data']['format'] == 'csv'
 
+    def test_export_sheet_csv_matches_openpyxl(self, runner, shared_strings_file, temp_dir):
+        """Test the XML fast path writes the same CSV bytes as openpyxl."""
+        from excel_agent.core.excel_agent_core import export_sheet_to_csv
+        from excel_agent.tools.excel_export_sheet import _fast_csv_export
+
+        for range_ref in (None, 'B1:D2', 'B2:E5'):
+            fast = temp_dir / 'fast.csv'
+            slow = temp_dir / 'openpyxl.csv'
+            rows = _fast_csv_export(shared_strings_file, 'Data', fast, range_ref)
+            assert rows == export_sheet_to_csv(shared_strings_file, 'Data', slow, range_ref)
+            assert fast.read_bytes() == slow.read_bytes(), range_ref
+
+        # The CLI takes the fast path and agrees too
+        output = temp_dir / 'cli.csv'
+        result = runner.run('excel_export_sheet.py', {
+            'file': shared_strings_file,
+            'sheet': 'Data',
+            'output': output,
+            'range': 'B2:E5'
+        })
+        assert result['returncode'] == 0
+        assert output.read_bytes() == slow.read_bytes()
+        assert b'2023-03-15' in output.read_bytes()
+
+    def test_export_sheet_json(self, runner, sample_file, temp_dir):
+        """Test exporting a range to JSON."""
+        runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'A1',
+            'value': 'Header',
+            'type': 'string'
+        })
+        runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'B2',
+            'value': '42',
+            'type': 'integer'
+        })
+
+        output = temp_dir / 'export.json'
+        result = runner.run('excel_export_sheet.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'output': output,
+            'range': 'A1:B2'
+        })
+
+        assert result['returncode'] == 0
+        assert result['data']['rows_exported'] == 2
+        assert json.loads(output.read_text()) == [['Header', None], [None, 42]]
+
+    def test_export_sheet_json_big_int(self, runner, sample_file, temp_dir):
+        """Test integers wider than 64 bits export with or without orjson."""
+        runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'A1',
+            'value': str(2 ** 70),
+            'type': 'integer'
+        })
+
+        output = temp_dir / 'export.json'
+        result = runner.run('excel_export_sheet.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'output': output,
+            'range': 'A1:B1'
+        })
+
+        assert result['returncode'] == 0
+        assert json.loads(output.read_text()) == [[2 ** 70, None]]
+
+    def test_export_all_sheets(self, runner, sample_file, temp_dir):
+        """Test exporting every sheet into a directory."""
+        runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'sheet': 'Sheet1',
+            'cell': 'A1',
+            'value': 'Header',
+            'type': 'string'
+        })
+
+        output_dir = temp_dir / 'exports'
+        result = runner.run('excel_export_sheet.py', {
+            'file': sample_file,
+            'all-sheets': True,
+            'output': output_dir,
+            'format': 'csv'
+        })
+
+        assert result['returncode'] == 0
+        assert sorted(result['data']['sheets']) == sorted(
+            p.stem for p in output_dir.glob('*.csv')
+        )
+        assert (output_dir / 'Sheet1.csv').read_text().strip() == 'Header'
+
+    def test_export_sheet_named_all(self, runner, sample_file, temp_dir):
+        """Test a sheet called ALL exports on its own."""
+        runner.run('excel_add_sheet.py', {'file': sample_file, 'sheet': 'ALL'})
+        runner.run('excel_set_value.py', {
+            'file': sample_file,
+            'sheet': 'ALL',
+            'cell': 'A1',
+            'value': 'Only me',
+            'type': 'string'
+        })
+
+        output = temp_dir / 'all.csv'
+        result = runner.run('excel_export_sheet.py', {
+            'file': sample_file,
+            'sheet': 'ALL',
+            'output': output
+        })
+
+        assert result['returncode'] == 0
+        assert result['data']['sheet'] == 'ALL'
+        assert output.read_text().strip() == 'Only me'
+
 
 # ============================================================================
 # VALIDATION & QUALITY TESTS
@@ -615,6 +1386,17 @@ class TestErrorHandling:
         
         assert result['returncode'] == 1
 
+    def test_compiled_a1_decoder_matches_fallback(self):
+        """Test the optional Cython decoder agrees with the pure-Python one."""
+        a1 = pytest.importorskip('excel_agent.core._a1')
+        from excel_agent.core.references import _decode_cell_reference
+
+        refs = ['A1', 'a1', 'Z9', 'AA10', 'xfd1048576', 'ZZZ9999999',
+                'A', '1', '', 'A0', 'AAAA1', 'A12345678', 'A1B', 'A-1',
+                'A 1', 'É1', 'A١', 'AB12345678', 'B2 ', '$A$1']
+        for ref in refs:
+            assert a1.decode(ref) == _decode_cell_reference(ref), ref
+
 
 # ============================================================================
 # INTEGRATION WORKFLOW TESTS
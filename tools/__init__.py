@@ -0,0 +1,6 @@
+"""
+Excel Agent CLI tools.
+
+Each module is a standalone command with a main() entry point; see
+TOOLS_REFERENCE.md.
+"""
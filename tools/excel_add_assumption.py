@@ -17,11 +17,11 @@ import argparse
 from pathlib import Path
 from typing import Dict, Any, Union
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.excel_agent_core import (
-    ExcelAgent, is_valid_cell_reference, get_number_format
-)
+from excel_agent.core.package import sheet_exists
+from excel_agent.core.references import is_valid_cell_reference
 
 
 def add_assumption(
@@ -31,7 +31,8 @@ def add_assumption(
     value: Union[str, float, int],
     description: str,
     format_type: str,
-    decimals: int
+    decimals: int,
+    fast_patch: bool = False
 ) -> Dict[str, Any]:
     """Add assumption with yellow highlight."""
     
@@ -41,26 +42,40 @@ def add_assumption(
     if not is_valid_cell_reference(cell):
         raise ValueError(f"Invalid cell reference: {cell}")
     
+    # Catch a mistyped sheet from workbook.xml alone, before a full load
+    if not sheet_exists(filepath, sheet):
+        raise ValueError(f"Sheet '{sheet}' not found")
+    
+    from excel_agent.core.excel_agent_core import ExcelAgent, get_number_format
+    
     # Get number format
     number_format = None
     if format_type:
         number_format = get_number_format(format_type, decimals)
     
-    with ExcelAgent(filepath) as agent:
-        agent.open(filepath)
-        
-        if sheet not in agent.wb.sheetnames:
-            raise ValueError(f"Sheet '{sheet}' not found")
-        
-        agent.add_assumption(
-            sheet=sheet,
-            cell=cell,
-            value=value,
-            description=description,
-            number_format=number_format
-        )
-        
-        agent.save()
+    patched = False
+    if fast_patch:
+        from excel_agent.core.fast_patch import FastPatchUnsupported, fast_add_assumption
+        try:
+            fast_add_assumption(filepath, sheet, cell, value, description, number_format)
+            patched = True
+        except FastPatchUnsupported:
+            pass
+    
+    if not patched:
+        with ExcelAgent.open_for_write(filepath) as agent:
+            if sheet not in agent.wb.sheetnames:
+                raise ValueError(f"Sheet '{sheet}' not found")
+            
+            agent.add_assumption(
+                sheet=sheet,
+                cell=cell,
+                value=value,
+                description=description,
+                number_format=number_format
+            )
+            
+            agent.save(copy_unedited=True)
     
     return {
         "status": "success",
@@ -70,11 +85,12 @@ def add_assumption(
         "value": value,
         "description": description,
         "format": format_type,
-        "style": "FinancialAssumption (yellow highlight)"
+        "style": "FinancialAssumption (yellow highlight)",
+        "fast_patch": patched
     }
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Add key assumption to Excel (yellow highlight)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -139,13 +155,27 @@ Examples:
         help='Decimal places (default: 2)'
     )
     
+    parser.add_argument(
+        '--fast-patch',
+        action='store_true',
+        help='Edit the sheet XML in place instead of re-saving the workbook '
+             '(falls back automatically when not possible)'
+    )
+    
     parser.add_argument(
         '--json',
         action='store_true',
         help='Output JSON response'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main():
+    args = _PARSER.parse_args()
     
     try:
         # Try to parse as number
@@ -161,7 +191,8 @@ Examples:
             value=value,
             description=args.description,
             format_type=args.format,
-            decimals=args.decimals
+            decimals=args.decimals,
+            fast_patch=args.fast_patch
         )
         
         if args.json:
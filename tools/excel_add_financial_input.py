@@ -17,9 +17,10 @@ import argparse
 from pathlib import Path
 from typing import Dict, Any
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.excel_agent_core import (
+from excel_agent.core.excel_agent_core import (
     ExcelAgent, is_valid_cell_reference, get_number_format
 )
 
@@ -60,7 +61,7 @@ def add_financial_input(
             number_format=number_format
         )
         
-        agent.save()
+        agent.save(copy_unedited=True)
     
     return {
         "status": "success",
@@ -18,11 +18,13 @@ import argparse
 from pathlib import Path
 from typing import Dict, Any
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.excel_agent_core import (
-    ExcelAgent, FormulaError, SecurityError, is_valid_cell_reference
-)
+from excel_agent.core.exceptions import SecurityError
+from excel_agent.core.formulas import scan_formula_security
+from excel_agent.core.package import sheet_exists
+from excel_agent.core.references import is_valid_cell_reference
 
 
 def add_formula(
@@ -32,7 +34,8 @@ def add_formula(
     formula: str,
     validate_refs: bool,
     allow_external: bool,
-    style: str = None
+    style: str = None,
+    fast_patch: bool = False
 ) -> Dict[str, Any]:
     """Add formula to cell."""
     
@@ -42,23 +45,41 @@ def add_formula(
     if not is_valid_cell_reference(cell):
         raise ValueError(f"Invalid cell reference: {cell}")
     
-    with ExcelAgent(filepath) as agent:
-        agent.open(filepath)
-        
-        # Verify sheet exists
-        if sheet not in agent.wb.sheetnames:
-            raise ValueError(f"Sheet '{sheet}' not found")
-        
-        # Add formula (this will do security checks)
-        agent.add_formula(
-            sheet=sheet,
-            cell=cell,
-            formula=formula,
-            validate_refs=validate_refs,
-            allow_external=allow_external
-        )
-        
-        agent.save()
+    # Reject unsafe formulas before touching the file at all
+    scan_formula_security(formula, allow_external)
+    
+    # Catch a mistyped sheet from workbook.xml alone, before a full load
+    if not sheet_exists(filepath, sheet):
+        raise ValueError(f"Sheet '{sheet}' not found")
+    
+    from excel_agent.core.excel_agent_core import ExcelAgent
+    
+    patched = False
+    if fast_patch:
+        from excel_agent.core.fast_patch import FastPatchUnsupported, fast_add_formula
+        try:
+            # Same security checks as ExcelAgent.add_formula
+            fast_add_formula(filepath, sheet, cell, formula, validate_refs, allow_external)
+            patched = True
+        except FastPatchUnsupported:
+            pass
+    
+    if not patched:
+        with ExcelAgent.open_for_write(filepath) as agent:
+            # Verify sheet exists
+            if sheet not in agent.wb.sheetnames:
+                raise ValueError(f"Sheet '{sheet}' not found")
+            
+            # Add formula (this will do security checks)
+            agent.add_formula(
+                sheet=sheet,
+                cell=cell,
+                formula=formula,
+                validate_refs=validate_refs,
+                allow_external=allow_external
+            )
+            
+            agent.save(copy_unedited=True)
     
     return {
         "status": "success",
@@ -69,11 +90,12 @@ def add_formula(
         "security_checks": {
             "validate_refs": validate_refs,
             "allow_external": allow_external
-        }
+        },
+        "fast_patch": patched
     }
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Add validated formula to Excel cell",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -149,13 +171,27 @@ Examples:
         help='Named style to apply'
     )
     
+    parser.add_argument(
+        '--fast-patch',
+        action='store_true',
+        help='Edit the sheet XML in place instead of re-saving the workbook '
+             '(falls back automatically when not possible)'
+    )
+    
     parser.add_argument(
         '--json',
         action='store_true',
         help='Output JSON response'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main():
+    args = _PARSER.parse_args()
     
     try:
         result = add_formula(
@@ -165,7 +201,8 @@ Examples:
             formula=args.formula,
             validate_refs=args.validate_refs,
             allow_external=args.allow_external,
-            style=args.style
+            style=args.style,
+            fast_patch=args.fast_patch
         )
         
         if args.json:
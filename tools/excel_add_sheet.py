@@ -17,9 +17,10 @@ import argparse
 from pathlib import Path
 from typing import Dict, Any
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.excel_agent_core import ExcelAgent, is_valid_sheet_name, sanitize_sheet_name
+from excel_agent.core.excel_agent_core import ExcelAgent, is_valid_sheet_name, sanitize_sheet_name
 
 
 def add_sheet(
@@ -17,9 +17,10 @@ import argparse
 from pathlib import Path
 from typing import Dict, Any
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.excel_agent_core import (
+from excel_agent.core.excel_agent_core import (
     ExcelAgent, is_valid_range_reference, parse_range, get_cell_coordinates
 )
 
@@ -67,7 +68,7 @@ def apply_range_formula(
             sample_formulas[start_cell] = ws[start_cell].value
             sample_formulas[end_cell] = ws[end_cell].value
         
-        agent.save()
+        agent.save(copy_unedited=True)
     
     return {
         "status": "success",
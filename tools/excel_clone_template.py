@@ -11,16 +11,129 @@ Exit Codes:
     1: Error occurred
 """
 
+import os
 import sys
 import json
 import argparse
 import shutil
+import zipfile
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.excel_agent_core import ExcelAgent, ExcelAgentError
+from excel_agent.core.package import (
+    NS_MAIN, ARC_CONTENT_TYPES, ARC_CALC_CHAIN, get_workbook_part, get_sheet_parts,
+    get_rels_part, read_rels, read_xml_part, write_xml_part, drop_part_refs, atomic_write,
+    open_package
+)
+
+# Parts holding copies of cell values that sheet XML edits cannot clear
+_VALUE_CACHE_PREFIXES = ("xl/pivotCache/", "xl/charts/")
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """Copy file contents in-kernel where supported, then copy metadata."""
+    if dst.exists() and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src} and {dst} are the same file")
+    
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+            while os.copy_file_range(src_fd, dst_fd, 2**30):
+                pass
+    except (AttributeError, OSError):
+        # copy_file_range is Linux-only and refuses some filesystems
+        shutil.copyfile(src, dst)
+    
+    shutil.copystat(src, dst)
+
+
+def _strip_sheet_xml(data: bytes, drop_values: bool, drop_formulas: bool) -> bytes:
+    """Remove cell values and/or formulas from worksheet XML, keeping styles."""
+    root, namespaces = read_xml_part(data)
+    
+    tag_f = f"{{{NS_MAIN}}}f"
+    tag_v = f"{{{NS_MAIN}}}v"
+    tag_is = f"{{{NS_MAIN}}}is"
+    
+    changed = False
+    for c in list(root.iter(f"{{{NS_MAIN}}}c")):
+        is_formula = c.find(tag_f) is not None
+        
+        if is_formula and drop_formulas:
+            drop = (tag_f, tag_v, tag_is)
+        elif drop_values:
+            # A kept formula's cached result derives from the cleared values
+            drop = (tag_v, tag_is)
+        else:
+            continue
+        
+        for child in list(c):
+            if child.tag in drop:
+                c.remove(child)
+                changed = True
+        c.attrib.pop("t", None)
+    
+    return write_xml_part(root, namespaces) if changed else data
+
+
+def _clone_stripped(
+    source: Path,
+    output: Path,
+    preserve_values: bool,
+    preserve_formulas: bool
+) -> Optional[List[str]]:
+    """
+    Clone by rewriting worksheet XML inside the zip package.
+    
+    Formatting, defined names and every other part are copied untouched,
+    except the shared strings table when values are cleared. Returns the
+    sheet names, or None (writing nothing) if the package keeps cached
+    values elsewhere, e.g. pivot caches or chart caches.
+    """
+    drop_values = not preserve_values
+    drop_formulas = not preserve_formulas
+    
+    with open_package(source) as zin:
+        if drop_values and any(name.startswith(_VALUE_CACHE_PREFIXES) for name in zin.NameToInfo):
+            return None
+        
+        sheet_parts = get_sheet_parts(zin)
+        targets = set(sheet_parts.values())
+        workbook_part = get_workbook_part(zin)
+        workbook_rels = get_rels_part(workbook_part)
+        
+        # Parts dropped from the clone: (part, relationship type suffix)
+        dropped = []
+        if drop_formulas:
+            dropped.append((ARC_CALC_CHAIN, "/calcChain"))
+        if drop_values:
+            # Cleared cells no longer reference it, and it still holds their text
+            dropped.extend(
+                (target, "/sharedStrings")
+                for rel_type, target in read_rels(zin, workbook_part).values()
+                if rel_type.endswith("/sharedStrings")
+            )
+        skipped = {part for part, _ in dropped}
+        
+        with atomic_write(output) as f, zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                if info.filename in skipped:
+                    continue
+                
+                data = zin.read(info)
+                if info.filename in targets:
+                    data = _strip_sheet_xml(data, drop_values, drop_formulas)
+                elif info.filename in (ARC_CONTENT_TYPES, workbook_rels):
+                    for part, rel_type in dropped:
+                        data = drop_part_refs(info.filename, data, part, rel_type)
+                
+                zout.writestr(info, data)
+    
+    return list(sheet_parts)
 
 
 def clone_template(
@@ -28,63 +141,88 @@ def clone_template(
     output: Path,
     preserve_values: bool,
     preserve_formulas: bool,
-    preserve_formatting: bool
+    preserve_formatting: bool,
+    want_json: bool = True
 ) -> Dict[str, Any]:
-    """Clone template file."""
+    """
+    Clone template file.
+    
+    file_size_bytes is only reported when want_json is set, since the
+    plain-text summary does not show it.
+    """
     
     if not source.exists():
         raise FileNotFoundError(f"Source file not found: {source}")
     
     # If preserving everything, just copy
     if preserve_values and preserve_formulas and preserve_formatting:
-        shutil.copy2(source, output)
-        return {
+        _fast_copy(source, output)
+        result = {
             "status": "success",
             "method": "full_copy",
             "source": str(source),
-            "output": str(output),
-            "file_size_bytes": output.stat().st_size
+            "output": str(output)
         }
+        if want_json:
+            result["file_size_bytes"] = output.stat().st_size
+        return result
     
-    # Otherwise, selective copy
-    with ExcelAgent(source) as agent:
-        agent.open(source, acquire_lock=False)
-        
-        # Get workbook info
-        info = agent.get_workbook_info()
+    # Otherwise, selective copy: edit the sheet XML directly when possible
+    sheets = None
+    if preserve_formatting:
+        try:
+            sheets = _clone_stripped(source, output, preserve_values, preserve_formulas)
+        except (zipfile.BadZipFile, KeyError, ET.ParseError):
+            sheets = None
+    
+    if sheets is None:
+        from excel_agent.core.excel_agent_core import ExcelAgent
         
-        # Clear values/formulas if requested
-        if not preserve_values or not preserve_formulas:
-            for sheet_name in agent.wb.sheetnames:
-                ws = agent.get_sheet(sheet_name)
-                
-                for row in ws.iter_rows():
-                    for cell in row:
+        with ExcelAgent.open_for_write(source, acquire_lock=False) as agent:
+            # Get workbook info
+            info = agent.get_workbook_info()
+            sheets = info["sheets"]
+            
+            # Clear values/formulas if requested
+            if not preserve_values or not preserve_formulas:
+                for sheet_name in agent.wb.sheetnames:
+                    ws = agent.get_sheet(sheet_name)
+                    
+                    # Visit only populated cells; iter_rows() would create
+                    # every empty cell in the used-range rectangle
+                    try:
+                        cells = list(ws._cells.values())
+                    except AttributeError:
+                        cells = [cell for row in ws.iter_rows() for cell in row]
+                    
+                    for cell in cells:
                         if not preserve_values and cell.data_type != 'f':
                             cell.value = None
                         
                         if not preserve_formulas and cell.data_type == 'f':
                             cell.value = None
-        
-        # Save to new location
-        agent.save(output)
+            
+            # Save to new location
+            agent.save(output)
     
-    return {
+    result = {
         "status": "success",
         "method": "selective_copy",
         "source": str(source),
         "output": str(output),
-        "sheets": info["sheets"],
+        "sheets": sheets,
         "preserved": {
             "values": preserve_values,
             "formulas": preserve_formulas,
             "formatting": preserve_formatting
-        },
-        "file_size_bytes": output.stat().st_size
+        }
     }
+    if want_json:
+        result["file_size_bytes"] = output.stat().st_size
+    return result
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Clone Excel template file",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -140,7 +278,14 @@ Examples:
         help='Output JSON response'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main():
+    args = _PARSER.parse_args()
     
     try:
         result = clone_template(
@@ -148,7 +293,8 @@ Examples:
             output=args.output,
             preserve_values=args.preserve_values,
             preserve_formulas=args.preserve_formulas,
-            preserve_formatting=args.preserve_formatting
+            preserve_formatting=args.preserve_formatting,
+            want_json=args.json
         )
         
         if args.json:
@@ -14,24 +14,192 @@ Exit Codes:
 import sys
 import json
 import argparse
+import zipfile
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any
+from xml.sax.saxutils import escape
 
-# Add parent directory to path for core import
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.excel_agent_core import (
-    ExcelAgent, ExcelAgentError, is_valid_sheet_name, sanitize_sheet_name
+from excel_agent.core.references import is_valid_sheet_name, sanitize_sheet_name
+
+
+# docProps/core.xml creator on every path
+_CREATOR = "Excel Agent Tool"
+
+# Static parts of a minimal workbook, matching what openpyxl writes for a
+# fresh workbook with create_financial_styles() applied, less the theme
+_SKELETON_RELS = (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>'
+    '<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties" Target="docProps/app.xml"/>'
+    '</Relationships>'
+)
+
+_SKELETON_APP = (
+    '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+    '<Application>Microsoft Excel Compatible</Application>'
+    '</Properties>'
+)
+
+_SKELETON_CORE = (
+    '<cp:coreProperties'
+    ' xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties"'
+    ' xmlns:dc="http://purl.org/dc/elements/1.1/"'
+    ' xmlns:dcterms="http://purl.org/dc/terms/"'
+    ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+    f'<dc:creator>{_CREATOR}</dc:creator>'
+    '<dcterms:created xsi:type="dcterms:W3CDTF">{now}</dcterms:created>'
+    '<dcterms:modified xsi:type="dcterms:W3CDTF">{now}</dcterms:modified>'
+    '</cp:coreProperties>'
 )
 
+_SKELETON_STYLES = (
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="4">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><color rgb="000000FF"/></font>'
+    '<font><color rgb="00000000"/></font>'
+    '<font><b val="1"/><color rgb="00000000"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00FFFF00"/><bgColor rgb="00FFFF00"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" applyAlignment="1"><alignment horizontal="left"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="0" applyAlignment="1"><alignment horizontal="right"/></xf>'
+    '<xf numFmtId="0" fontId="3" fillId="2" borderId="0" applyAlignment="1"><alignment horizontal="center"/></xf>'
+    '</cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="4">'
+    '<cellStyle name="Normal" xfId="0" builtinId="0"/>'
+    '<cellStyle name="FinancialInput" xfId="1"/>'
+    '<cellStyle name="FinancialFormula" xfId="2"/>'
+    '<cellStyle name="FinancialAssumption" xfId="3"/>'
+    '</cellStyles>'
+    '<tableStyles count="0" defaultTableStyle="TableStyleMedium9" defaultPivotStyle="PivotStyleLight16"/>'
+    '</styleSheet>'
+)
+
+_SKELETON_SHEET = (
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0"/></sheetViews>'
+    '<sheetFormatPr defaultRowHeight="15"/>'
+    '<sheetData/>'
+    '<pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>'
+    '</worksheet>'
+)
+
+_ATTR_ENTITIES = {'"': "&quot;"}
+_CT_WORKSHEET = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+_REL_WORKSHEET = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"
+
+
+class _SkeletonUnsupported(Exception):
+    """Raised when the sheet names need openpyxl's XML serializer."""
+
+
+def _create_new_skeleton(sheet_names: list, output: Path) -> None:
+    """
+    Create workbook by writing a minimal xlsx package directly.
+    
+    Raises _SkeletonUnsupported, before writing anything, for sheet names
+    with control characters (tabs, newlines, ...), which the plain
+    attribute escaping here does not preserve.
+    """
+    if any(ch < " " for name in sheet_names for ch in name):
+        raise _SkeletonUnsupported("control character in a sheet name")
+    
+    content_types = [
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '<Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+        '<Override PartName="/docProps/app.xml" ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>'
+    ]
+    workbook = [
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+        ' xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<workbookPr/>'
+        '<bookViews><workbookView activeTab="0"/></bookViews>'
+        '<sheets>'
+    ]
+    rels = ['<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">']
+    
+    for i, name in enumerate(sheet_names, 1):
+        content_types.append(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="{_CT_WORKSHEET}"/>'
+        )
+        workbook.append(
+            f'<sheet name="{escape(name, _ATTR_ENTITIES)}" sheetId="{i}" r:id="rId{i}"/>'
+        )
+        rels.append(
+            f'<Relationship Id="rId{i}" Type="{_REL_WORKSHEET}" Target="worksheets/sheet{i}.xml"/>'
+        )
+    
+    content_types.append('</Types>')
+    workbook.append('</sheets><calcPr calcId="124519" fullCalcOnLoad="1"/></workbook>')
+    rels.append(
+        f'<Relationship Id="rId{len(sheet_names) + 1}"'
+        ' Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"'
+        ' Target="styles.xml"/>'
+        '</Relationships>'
+    )
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zout:
+        zout.writestr("[Content_Types].xml", "".join(content_types))
+        zout.writestr("_rels/.rels", _SKELETON_RELS)
+        zout.writestr("docProps/app.xml", _SKELETON_APP)
+        zout.writestr("docProps/core.xml", _SKELETON_CORE.format(now=now))
+        zout.writestr("xl/workbook.xml", "".join(workbook))
+        zout.writestr("xl/_rels/workbook.xml.rels", "".join(rels))
+        zout.writestr("xl/styles.xml", _SKELETON_STYLES)
+        for i in range(1, len(sheet_names) + 1):
+            zout.writestr(f"xl/worksheets/sheet{i}.xml", _SKELETON_SHEET)
+
+
+def _create_new_write_only(sheet_names: list, output: Path) -> None:
+    """Create workbook with openpyxl's write-only workbook (no cell caches)."""
+    from openpyxl import Workbook
+    from excel_agent.core.excel_agent_core import create_financial_styles
+    
+    wb = Workbook(write_only=True)
+    # Write-only workbooks start without a default sheet
+    for name in sheet_names:
+        wb.create_sheet(title=name)
+    
+    create_financial_styles(wb)
+    wb.properties.creator = _CREATOR
+    
+    output.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(output)
+
 
 def create_new_workbook(
     output: Path,
     sheets: list,
     template: Path = None,
-    dry_run: bool = False
+    dry_run: bool = False,
+    write_only: bool = True,
+    want_json: bool = True
 ) -> Dict[str, Any]:
-    """Create new workbook with specified sheets."""
+    """
+    Create new workbook with specified sheets.
+    
+    file_size_bytes is only reported when want_json is set, since the
+    plain-text summary does not show it.
+    """
     
     # Validate sheet names
     validated_sheets = []
@@ -44,8 +212,8 @@ def create_new_workbook(
             sheet_name = sanitized
         validated_sheets.append(sheet_name)
     
-    # Check for duplicates
-    if len(validated_sheets) != len(set(validated_sheets)):
+    # Check for duplicates; Excel compares sheet names case-insensitively
+    if len(validated_sheets) != len({name.casefold() for name in validated_sheets}):
         raise ValueError("Duplicate sheet names detected")
     
     if dry_run:
@@ -56,32 +224,42 @@ def create_new_workbook(
             "warnings": warnings
         }
     
+    # Apply template if specified
+    if template:
+        # Template application would be done here
+        # For now, we just note it
+        warnings.append("Template application not yet implemented")
+    
     # Create workbook
-    with ExcelAgent() as agent:
-        agent.create_new(validated_sheets)
-        
-        # Apply template if specified
-        if template:
-            # Template application would be done here
-            # For now, we just note it
-            warnings.append("Template application not yet implemented")
+    if write_only:
+        try:
+            _create_new_skeleton(validated_sheets, output)
+        except _SkeletonUnsupported:
+            _create_new_write_only(validated_sheets, output)
+    else:
+        from excel_agent.core.excel_agent_core import ExcelAgent
         
-        agent.save(output)
+        with ExcelAgent() as agent:
+            agent.create_new(validated_sheets)
+            agent.wb.properties.creator = _CREATOR
+            agent.save(output)
     
-    # Get file info
-    file_size = output.stat().st_size if output.exists() else 0
-    
-    return {
+    result = {
         "status": "success",
         "file": str(output),
         "sheets": validated_sheets,
         "sheet_count": len(validated_sheets),
-        "file_size_bytes": file_size,
         "warnings": warnings
     }
+    
+    # Get file info
+    if want_json:
+        result["file_size_bytes"] = output.stat().st_size if output.exists() else 0
+    
+    return result
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Create new Excel workbook with specified sheets",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -123,13 +301,34 @@ Examples:
         help='Validate inputs without creating file'
     )
     
+    parser.add_argument(
+        '--write-only',
+        action='store_true',
+        default=True,
+        help='Write the package directly, without an in-memory workbook (default: true)'
+    )
+    
+    parser.add_argument(
+        '--no-write-only',
+        dest='write_only',
+        action='store_false',
+        help='Build with a regular in-memory workbook'
+    )
+    
     parser.add_argument(
         '--json',
         action='store_true',
         help='Output JSON response'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main():
+    args = _PARSER.parse_args()
     
     try:
         # Parse sheets
@@ -147,7 +346,9 @@ Examples:
             output=args.output,
             sheets=sheets,
             template=args.template,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            write_only=args.write_only,
+            want_json=args.json
         )
         
         if args.json:
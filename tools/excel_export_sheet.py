@@ -11,16 +11,293 @@ Exit Codes:
     1: Error occurred
 """
 
+import os
 import sys
 import json
 import argparse
 import csv
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time
+from decimal import Decimal
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Set, Tuple
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
 
-from core.excel_agent_core import ExcelAgent, export_sheet_to_csv, is_valid_range_reference
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from excel_agent.core.package import NS_MAIN, get_workbook_part, get_sheet_parts, read_rels, open_package
+from excel_agent.core.references import is_valid_range_reference, parse_range
+
+_TAG_ROW = f"{{{NS_MAIN}}}row"
+_TAG_C = f"{{{NS_MAIN}}}c"
+_TAG_V = f"{{{NS_MAIN}}}v"
+_TAG_F = f"{{{NS_MAIN}}}f"
+_TAG_IS = f"{{{NS_MAIN}}}is"
+_TAG_T = f"{{{NS_MAIN}}}t"
+_TAG_R = f"{{{NS_MAIN}}}r"
+_TAG_DIMENSION = f"{{{NS_MAIN}}}dimension"
+
+
+class _FastPathUnsupported(Exception):
+    """Raised when a sheet needs openpyxl's full reader."""
+
+
+def _string_item_text(item: ET.Element) -> str:
+    """Plain text of a shared/inline string item (phonetic runs skipped)."""
+    parts = []
+    for child in item:
+        if child.tag == _TAG_T:
+            parts.append(child.text or "")
+        elif child.tag == _TAG_R:
+            parts.append(child.findtext(_TAG_T) or "")
+    return "".join(parts)
+
+
+def _load_shared_strings(archive: zipfile.ZipFile, part: Optional[str]) -> List[str]:
+    """Pre-load the shared string table."""
+    strings = []
+    if part is None:
+        return strings
+    
+    tag_si = f"{{{NS_MAIN}}}si"
+    with archive.open(part) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag == tag_si:
+                strings.append(_string_item_text(elem))
+                elem.clear()
+    return strings
+
+
+def _load_date_styles(archive: zipfile.ZipFile, part: Optional[str]) -> Tuple[Set[int], Set[int]]:
+    """Return the cellXfs indices formatted as dates and as timedeltas."""
+    from openpyxl.styles.numbers import (
+        builtin_format_code, is_date_format, is_timedelta_format
+    )
+    
+    date_styles, timedelta_styles = set(), set()
+    if part is None:
+        return date_styles, timedelta_styles
+    
+    root = ET.fromstring(archive.read(part))
+    custom = {
+        int(fmt.get("numFmtId")): fmt.get("formatCode")
+        for fmt in root.iter(f"{{{NS_MAIN}}}numFmt")
+    }
+    cell_xfs = root.find(f"{{{NS_MAIN}}}cellXfs")
+    if cell_xfs is None:
+        return date_styles, timedelta_styles
+    
+    for idx, xf in enumerate(cell_xfs.iter(f"{{{NS_MAIN}}}xf")):
+        fmt_id = int(xf.get("numFmtId", 0))
+        fmt = custom[fmt_id] if fmt_id in custom else builtin_format_code(fmt_id)
+        if is_date_format(fmt):
+            date_styles.add(idx)
+        if is_timedelta_format(fmt):
+            timedelta_styles.add(idx)
+    return date_styles, timedelta_styles
+
+
+def _cast_number(value: str):
+    """Convert a numeric cell string the way openpyxl does."""
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def _fast_csv_export(
+    filepath: Path,
+    sheet: str,
+    output: Path,
+    range_ref: Optional[str]
+) -> int:
+    """
+    Export sheet to CSV by parsing the worksheet XML directly.
+    
+    Produces the same rows as export_sheet_to_csv without building
+    openpyxl cells. Raises _FastPathUnsupported for content it does not
+    handle (array formulas, pivot caches, ...).
+    """
+    from openpyxl.formula.translate import Translator
+    from excel_agent.core.excel_agent_core import get_cell_coordinates
+    from openpyxl.utils.cell import coordinate_to_tuple
+    from openpyxl.utils.datetime import from_excel, from_ISO8601, CALENDAR_WINDOWS_1900, CALENDAR_MAC_1904
+    
+    with open_package(filepath) as archive:
+        if any(name.startswith("xl/pivotCache") for name in archive.namelist()):
+            raise _FastPathUnsupported("pivot caches present")
+        
+        sheet_parts = get_sheet_parts(archive)
+        if sheet not in sheet_parts:
+            raise KeyError(f"Sheet '{sheet}' not found. Available: {list(sheet_parts)}")
+        sheet_part = sheet_parts[sheet]
+        if not sheet_part.startswith("xl/worksheets/"):
+            raise _FastPathUnsupported("not a worksheet")
+        
+        workbook_part = get_workbook_part(archive)
+        rel_targets = {
+            rel_type.rsplit("/", 1)[-1]: target
+            for rel_type, target in read_rels(archive, workbook_part).values()
+        }
+        shared_strings = _load_shared_strings(archive, rel_targets.get("sharedStrings"))
+        date_styles, timedelta_styles = _load_date_styles(archive, rel_targets.get("styles"))
+        
+        workbook_pr = ET.fromstring(archive.read(workbook_part)).find(f"{{{NS_MAIN}}}workbookPr")
+        date1904 = workbook_pr is not None and workbook_pr.get("date1904") in ("1", "true")
+        epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+        
+        min_row = min_col = 1
+        max_row = max_col = None
+        if range_ref:
+            start_cell, end_cell = parse_range(range_ref)
+            min_row, min_col = get_cell_coordinates(start_cell)
+            max_row, max_col = get_cell_coordinates(end_cell)
+        
+        shared_formulae = {}
+        
+        def cell_value(c: ET.Element, coordinate: str):
+            data_type = c.get("t", "n")
+            
+            f = c.find(_TAG_F)
+            if f is not None:
+                formula_type = f.get("t")
+                value = "=" + (f.text or "")
+                if formula_type == "shared":
+                    si = f.get("si")
+                    if f.get("ref"):
+                        shared_formulae[si] = Translator(value, coordinate)
+                    elif si in shared_formulae:
+                        value = shared_formulae[si].translate_formula(coordinate)
+                elif formula_type is not None:
+                    raise _FastPathUnsupported(f"{formula_type} formula in {coordinate}")
+                return value
+            
+            if data_type == "inlineStr":
+                item = c.find(_TAG_IS)
+                return _string_item_text(item) if item is not None else None
+            
+            value = c.findtext(_TAG_V) or None
+            if value is None:
+                return None
+            if data_type == "n":
+                value = _cast_number(value)
+                style_id = int(c.get("s", 0))
+                if style_id in date_styles:
+                    try:
+                        value = from_excel(value, epoch, timedelta=style_id in timedelta_styles)
+                    except (OverflowError, ValueError):
+                        value = "#VALUE!"
+            elif data_type == "s":
+                value = shared_strings[int(value)]
+            elif data_type == "b":
+                value = bool(int(value))
+            elif data_type == "d":
+                value = from_ISO8601(value)
+            return value
+        
+        row_count = 0
+        with archive.open(sheet_part) as src, \
+                open(output, "w", newline="", encoding="utf-8") as out:
+            writer = csv.writer(out)
+            empty_row = () if max_col is None else (None,) * (max_col + 1 - min_col)
+            counter = min_row
+            row_idx = 0
+            col_counter = 0
+            stopped = False
+            
+            for _, elem in ET.iterparse(src):
+                tag = elem.tag
+                if tag == _TAG_DIMENSION and not range_ref:
+                    bounds = elem.get("ref", "").split(":")
+                    if bounds[0]:
+                        max_row, max_col = coordinate_to_tuple(bounds[-1].replace("$", ""))
+                        empty_row = (None,) * (max_col + 1 - min_col)
+                    continue
+                if tag != _TAG_ROW:
+                    continue
+                
+                row_idx = int(elem.get("r", row_idx + 1))
+                if max_row is not None and row_idx > max_row:
+                    stopped = True
+                    break
+                
+                # Some rows are missing
+                while counter < row_idx:
+                    writer.writerow(empty_row)
+                    row_count += 1
+                    counter += 1
+                
+                if counter <= row_idx:
+                    cells = []
+                    col_counter = 0
+                    for c in elem.iter(_TAG_C):
+                        coordinate = c.get("r")
+                        if coordinate:
+                            _, col_counter = coordinate_to_tuple(coordinate)
+                        else:
+                            col_counter += 1
+                        cells.append((col_counter, cell_value(c, coordinate)))
+                    
+                    if cells or max_col:
+                        width = (max_col or cells[-1][0]) + 1 - min_col
+                        values = [None] * width
+                        for column, value in cells:
+                            if min_col <= column <= min_col + width - 1:
+                                values[column - min_col] = value
+                        writer.writerow(values)
+                    else:
+                        writer.writerow(())
+                    row_count += 1
+                    counter += 1
+                
+                elem.clear()
+            
+            if stopped:
+                while counter <= max_row:
+                    writer.writerow(empty_row)
+                    row_count += 1
+                    counter += 1
+    
+    return row_count
+
+
+# Cell value types the JSON encoders handle natively
+_JSON_NATIVE = {str, int, float, bool, type(None)}
+
+
+def _json_value(value: Any) -> Any:
+    """Convert a non-native cell value to something JSON can encode."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+if orjson is not None:
+    def _encode_row(row: list) -> bytes:
+        """Encode one exported row (already JSON-native) as JSON bytes."""
+        try:
+            return orjson.dumps(row)
+        except orjson.JSONEncodeError:
+            # Integers wider than 64 bits; json writes them, in orjson's layout
+            return json.dumps(row, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+else:
+    def _encode_row(row: list) -> bytes:
+        """Encode one exported row (already JSON-native) as JSON bytes."""
+        return json.dumps(row).encode('utf-8')
+
+
+def _open_readonly(filepath: Path, data_only: bool):
+    """Open workbook in openpyxl read-only (streaming) mode."""
+    from openpyxl import load_workbook
+    return load_workbook(filepath, read_only=True, data_only=data_only)
 
 
 def export_sheet_to_json(
@@ -31,49 +308,142 @@ def export_sheet_to_json(
     include_formulas: bool
 ) -> int:
     """Export sheet to JSON."""
-    with ExcelAgent(filepath) as agent:
-        agent.open(filepath, acquire_lock=False)
-        ws = agent.get_sheet(sheet)
-        
-        data = []
+    wb = _open_readonly(filepath, data_only=not include_formulas)
+    try:
+        if sheet not in wb.sheetnames:
+            raise KeyError(f"Sheet '{sheet}' not found. Available: {wb.sheetnames}")
+        ws = wb[sheet]
         
+        bounds = {}
         if range_ref:
-            from core.excel_agent_core import parse_range, get_cell_coordinates
+            from excel_agent.core.excel_agent_core import get_cell_coordinates
             start_cell, end_cell = parse_range(range_ref)
             start_row, start_col = get_cell_coordinates(start_cell)
             end_row, end_col = get_cell_coordinates(end_cell)
-            rows = ws.iter_rows(min_row=start_row, max_row=end_row,
-                               min_col=start_col, max_col=end_col)
-        else:
-            rows = ws.iter_rows()
+            bounds = dict(min_row=start_row, max_row=end_row,
+                          min_col=start_col, max_col=end_col)
         
-        for row in rows:
-            row_data = []
-            for cell in row:
-                if include_formulas and cell.data_type == 'f':
-                    row_data.append({
-                        "formula": cell.value,
+        if include_formulas:
+            rows = (
+                [
+                    {
+                        "formula": cell.value if type(cell.value) is str else _json_value(cell.value),
                         "value": None  # Formulas don't have cached values in write mode
-                    })
-                else:
-                    row_data.append(cell.value)
-            data.append(row_data)
-        
-        with open(output, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
+                    } if cell.data_type == 'f' else cell.value
+                    for cell in row
+                ]
+                for row in ws.iter_rows(**bounds)
+            )
+        else:
+            # values_only skips building cell objects entirely
+            rows = ws.iter_rows(values_only=True, **bounds)
         
-        return len(data)
+        # Stream one row at a time so memory stays O(row width); dates and
+        # decimals are converted up front so the encoder never needs a
+        # default= fallback
+        row_count = 0
+        with open(output, 'wb') as f:
+            f.write(b'[')
+            for row in rows:
+                f.write(b'\n' if row_count == 0 else b',\n')
+                f.write(_encode_row([
+                    v if type(v) in _JSON_NATIVE or type(v) is dict else _json_value(v)
+                    for v in row
+                ]))
+                row_count += 1
+            f.write(b'\n]')
+    finally:
+        wb.close()
+    
+    return row_count
 
 
-def export_sheet(
+def _export_one(
     filepath: Path,
     sheet: str,
     output: Path,
     format_type: str,
     range_ref: str,
     include_formulas: bool
+) -> int:
+    """Export a single sheet in the given format; returns rows written."""
+    if format_type == "csv":
+        try:
+            return _fast_csv_export(filepath, sheet, output, range_ref)
+        except (_FastPathUnsupported, zipfile.BadZipFile, ET.ParseError):
+            from excel_agent.core.excel_agent_core import export_sheet_to_csv
+            return export_sheet_to_csv(filepath, sheet, output, range_ref)
+    elif format_type == "json":
+        return export_sheet_to_json(filepath, sheet, output, range_ref, include_formulas)
+    else:
+        raise ValueError(f"Unknown format: {format_type}")
+
+
+def export_all_sheets(
+    filepath: Path,
+    output_dir: Path,
+    format_type: str,
+    range_ref: str,
+    include_formulas: bool
+) -> Dict[str, Any]:
+    """Export every worksheet to <output_dir>/<sheet>.<format>, in parallel."""
+    if format_type not in ("csv", "json"):
+        raise ValueError("--format csv or json is required with --all-sheets")
+    
+    wb = _open_readonly(filepath, data_only=True)
+    try:
+        # Chartsheets have no cells to export
+        sheet_names = [ws.title for ws in wb.worksheets]
+    finally:
+        wb.close()
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    outputs = {name: output_dir / f"{name}.{format_type}" for name in sheet_names}
+    
+    # Each worker opens its own read-only workbook; nothing is shared
+    workers = max(1, min(len(sheet_names), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            name: executor.submit(
+                _export_one, filepath, name, outputs[name],
+                format_type, range_ref, include_formulas
+            )
+            for name in sheet_names
+        }
+        row_counts = {name: future.result() for name, future in futures.items()}
+    
+    sheets = {
+        name: {
+            "output_file": str(outputs[name]),
+            "rows_exported": row_counts[name],
+            "file_size_bytes": outputs[name].stat().st_size
+        }
+        for name in sheet_names
+    }
+    
+    return {
+        "status": "success",
+        "source_file": str(filepath),
+        "output_dir": str(output_dir),
+        "format": format_type,
+        "sheets": sheets,
+        "rows_exported": sum(row_counts.values()),
+        "file_size_bytes": sum(info["file_size_bytes"] for info in sheets.values()),
+        "range": range_ref,
+        "included_formulas": include_formulas
+    }
+
+
+def export_sheet(
+    filepath: Path,
+    sheet: str,
+    output: Path,
+    format_type: str,
+    range_ref: str,
+    include_formulas: bool,
+    all_sheets: bool = False
 ) -> Dict[str, Any]:
-    """Export sheet to file."""
+    """Export sheet to file, or every worksheet into the output directory."""
     
     if not filepath.exists():
         raise FileNotFoundError(f"File not found: {filepath}")
@@ -81,6 +451,9 @@ def export_sheet(
     if range_ref and not is_valid_range_reference(range_ref):
         raise ValueError(f"Invalid range reference: {range_ref}")
     
+    if all_sheets:
+        return export_all_sheets(filepath, output, format_type, range_ref, include_formulas)
+    
     # Auto-detect format from extension
     if format_type == "auto":
         ext = output.suffix.lower()
@@ -92,12 +465,7 @@ def export_sheet(
             raise ValueError(f"Cannot auto-detect format from extension: {ext}")
     
     # Export
-    if format_type == "csv":
-        row_count = export_sheet_to_csv(filepath, sheet, output, range_ref)
-    elif format_type == "json":
-        row_count = export_sheet_to_json(filepath, sheet, output, range_ref, include_formulas)
-    else:
-        raise ValueError(f"Unknown format: {format_type}")
+    row_count = _export_one(filepath, sheet, output, format_type, range_ref, include_formulas)
     
     file_size = output.stat().st_size
     
@@ -114,7 +482,7 @@ def export_sheet(
     }
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Export Excel worksheet to CSV or JSON",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -131,6 +499,9 @@ Examples:
   
   # Auto-detect format from extension
   uv python excel_export_sheet.py --file model.xlsx --sheet Summary --output summary.csv --format auto --json
+  
+  # Export every sheet into a directory (one file per sheet)
+  uv python excel_export_sheet.py --file model.xlsx --all-sheets --output exports/ --format csv --json
         """
     )
     
@@ -141,17 +512,22 @@ Examples:
         help='Excel file path'
     )
     
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         '--sheet',
-        required=True,
         help='Sheet name to export'
     )
+    target.add_argument(
+        '--all-sheets',
+        action='store_true',
+        help='Export every worksheet into the --output directory'
+    )
     
     parser.add_argument(
         '--output',
         required=True,
         type=Path,
-        help='Output file path'
+        help='Output file path (directory with --all-sheets)'
     )
     
     parser.add_argument(
@@ -178,7 +554,14 @@ Examples:
         help='Output JSON response'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main():
+    args = _PARSER.parse_args()
     
     try:
         result = export_sheet(
@@ -187,13 +570,18 @@ Examples:
             output=args.output,
             format_type=args.format,
             range_ref=args.range,
-            include_formulas=args.include_formulas
+            include_formulas=args.include_formulas,
+            all_sheets=args.all_sheets
         )
         
         if args.json:
             print(json.dumps(result, indent=2))
         else:
-            print(f"✅ Exported {result['rows_exported']} rows to {args.output}")
+            if 'sheets' in result:
+                print(f"✅ Exported {result['rows_exported']} rows from "
+                      f"{len(result['sheets'])} sheets to {args.output}")
+            else:
+                print(f"✅ Exported {result['rows_exported']} rows to {args.output}")
             print(f"   Format: {result['format']}")
             print(f"   Size: {result['file_size_bytes']} bytes")
         
@@ -17,9 +17,10 @@ import argparse
 from pathlib import Path
 from typing import Dict, Any
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.excel_agent_core import (
+from excel_agent.core.excel_agent_core import (
     ExcelAgent, is_valid_range_reference, get_number_format
 )
 
@@ -58,7 +59,7 @@ def format_range(
             number_format=number_format
         )
         
-        agent.save()
+        agent.save(copy_unedited=True)
     
     return {
         "status": "success",
@@ -5,52 +5,205 @@ Set a single cell value with optional styling
 
 Usage:
     uv python excel_set_value.py --file model.xlsx --sheet Sheet1 --cell A1 --value "Revenue" --type string --json
+    uv python excel_set_value.py --file model.xlsx --batch - --json < edits.jsonl
+    uv python excel_set_value.py --daemon --socket /tmp/excel-agent.sock
 
 Exit Codes:
     0: Success
     1: Error occurred
 """
 
+import os
 import sys
 import json
+import math
 import argparse
+import functools
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Union
-from datetime import datetime
+from typing import BinaryIO, Dict, Any, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
 
-from core.excel_agent_core import (
-    ExcelAgent, ExcelAgentError, is_valid_cell_reference
-)
+if TYPE_CHECKING:
+    from datetime import datetime
 
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def parse_value(value_str: str, value_type: str) -> Union[str, int, float, datetime]:
+from excel_agent.core.package import list_sheet_names
+from excel_agent.core.exceptions import ValidationError
+from excel_agent.core.references import is_valid_cell_reference
+
+
+# datetime.fromisoformat, bound on the first --type date value
+_fromisoformat = None
+
+# Daemon defaults
+DEFAULT_SOCKET = "/tmp/excel-agent.sock"
+MAX_OPEN_WORKBOOKS = 4
+DEFAULT_FLUSH_EVERY = 50
+DEFAULT_IDLE_TIMEOUT = 30.0
+
+
+if orjson is not None:
+    def _encode_json(obj: Dict[str, Any], indent: bool = False) -> bytes:
+        """Encode a result dict as JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+else:
+    def _encode_json(obj: Dict[str, Any], indent: bool = False) -> bytes:
+        """Encode a result dict as JSON bytes."""
+        return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def _print_json(obj: Dict[str, Any], stream=None) -> None:
+    """Print obj as indented JSON, writing bytes straight to stream's buffer."""
+    stream = stream or sys.stdout
+    stream.flush()
+    stream.buffer.write(_encode_json(obj, indent=True) + b"\n")
+    stream.buffer.flush()
+
+
+def _parse_date(value_str: str) -> "datetime":
+    global _fromisoformat
+    if _fromisoformat is None:
+        from datetime import datetime
+        _fromisoformat = datetime.fromisoformat
+    return _fromisoformat(value_str)
+
+
+def _parse_auto(value_str: str) -> Union[str, int, float]:
+    # Plain (optionally signed) integers are by far the most common input
+    digits = value_str[1:] if value_str[:1] in ("+", "-") else value_str
+    if digits.isdigit() and digits.isascii():
+        return int(value_str)
+    try:
+        if '.' in value_str:
+            number = float(value_str)
+            # '1e999.' overflows to inf, which Excel cannot store
+            return number if math.isfinite(number) else value_str
+        return int(value_str)
+    except ValueError:
+        return value_str
+
+
+# --type choices, in help order
+_PARSERS = {
+    "auto": _parse_auto,
+    "string": str,
+    "number": float,
+    "integer": int,
+    "date": _parse_date,
+}
+
+
+def parse_value(value_str: str, value_type: str) -> Union[str, int, float, "datetime"]:
     """Parse value according to type."""
+    try:
+        parser = _PARSERS[value_type]
+    except KeyError:
+        raise ValueError(f"Unknown value type: {value_type}") from None
+    return parser(value_str)
+
+
+@functools.lru_cache(maxsize=32)
+def _sheet_index(path_str: str, mtime_ns: int, size: int) -> Optional[Tuple[str, ...]]:
+    """Sheet names of a workbook, cached until the file changes on disk."""
+    names = list_sheet_names(Path(path_str))
+    return None if names is None else tuple(names)
+
+
+def _check_writable_format(filepath: Path) -> None:
+    """Refuse formats that cannot be written back (nothing here writes .xlsb)."""
+    if filepath.suffix.lower() == '.xlsb':
+        raise ValidationError(
+            f".xlsb workbooks are read-only: {filepath.name}. Convert it to .xlsx "
+            f"first (e.g. soffice --headless --convert-to xlsx {filepath.name}) and edit that"
+        )
+
+
+def _describe(sheet: str, cell: str, value: Any, style: Optional[str], number_format: Optional[str]) -> Dict[str, Any]:
+    """Result fields for one edited cell."""
+    return {
+        "sheet": sheet,
+        "cell": cell,
+        "value": str(value),
+        "type": type(value).__name__,
+        "style": style,
+        "number_format": number_format
+    }
+
+
+def _apply(
+    agent,
+    sheet: str,
+    cell: str,
+    value: Any,
+    style: Optional[str] = None,
+    number_format: Optional[str] = None
+) -> None:
+    """Set one cell on an open ExcelAgent without saving."""
+    if not is_valid_cell_reference(cell):
+        raise ValueError(f"Invalid cell reference: {cell}")
     
-    if value_type == "auto":
-        # Try to auto-detect
-        try:
-            if '.' in value_str:
-                return float(value_str)
-            return int(value_str)
-        except ValueError:
-            return value_str
+    if sheet not in agent.wb.sheetnames:
+        raise ValueError(f"Sheet '{sheet}' not found. Available: {agent.wb.sheetnames}")
     
-    elif value_type == "string":
-        return value_str
+    agent.set_cell_value(
+        sheet=sheet,
+        cell=cell,
+        value=value,
+        style=style,
+        number_format=number_format
+    )
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_noop(ws, cell: str, value: Any, style: Optional[str], number_format: Optional[str]) -> bool:
+    """Whether the cell already holds value with the requested style and format."""
+    current = ws[cell]
+    old = current.value
     
-    elif value_type == "number":
-        return float(value_str)
+    # 1 == 1.0 is the same cell content, but True == 1 is not
+    if type(old) is not type(value) and not (_is_number(old) and _is_number(value)):
+        return False
+    if old != value:
+        return False
     
-    elif value_type == "integer":
-        return int(value_str)
+    if number_format is not None and current.number_format != number_format:
+        return False
     
-    elif value_type == "date":
-        return datetime.fromisoformat(value_str)
+    if style is not None:
+        style_array = getattr(current, "style_array", None)
+        names = ws.parent._named_styles.names
+        if style_array is None or style_array.xfId >= len(names) or names[style_array.xfId] != style:
+            return False
     
-    else:
-        raise ValueError(f"Unknown value type: {value_type}")
+    return True
+
+
+def _apply_if_changed(
+    agent,
+    sheet: str,
+    cell: str,
+    value: Any,
+    style: Optional[str] = None,
+    number_format: Optional[str] = None
+) -> bool:
+    """_apply() unless the cell already holds the edit; returns whether it did."""
+    if sheet not in agent.wb.sheetnames:
+        raise ValueError(f"Sheet '{sheet}' not found. Available: {agent.wb.sheetnames}")
+    
+    if _is_noop(agent.wb[sheet], cell, value, style, number_format):
+        return False
+    _apply(agent, sheet, cell, value, style, number_format)
+    return True
 
 
 def set_cell_value(
@@ -59,43 +212,413 @@ def set_cell_value(
     cell: str,
     value: Any,
     style: str = None,
-    number_format: str = None
+    number_format: str = None,
+    no_recalc: bool = False,
+    dry_run: bool = False,
+    out: Optional[BinaryIO] = None
 ) -> Dict[str, Any]:
-    """Set cell value."""
+    """
+    Set cell value.
     
-    if not filepath.exists():
-        raise FileNotFoundError(f"File not found: {filepath}")
+    dry_run checks the edit without writing anything. With out, the
+    edited workbook is written there and filepath is left unchanged.
+    """
+    
+    # One stat serves as the existence check and the sheet cache key
+    path_str = os.fspath(filepath)
+    try:
+        st = os.stat(path_str)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}") from None
     
     if not is_valid_cell_reference(cell):
         raise ValueError(f"Invalid cell reference: {cell}")
     
-    with ExcelAgent(filepath) as agent:
-        agent.open(filepath)
+    _check_writable_format(filepath)
+    
+    # A mistyped sheet fails here, from workbook.xml alone
+    sheet_names = _sheet_index(path_str, st.st_mtime_ns, st.st_size)
+    if sheet_names is not None and sheet not in sheet_names:
+        raise ValueError(f"Sheet '{sheet}' not found. Available: {list(sheet_names)}")
+    
+    from excel_agent.core.excel_agent_core import ExcelAgent
+    
+    if dry_run:
+        with ExcelAgent(filepath, validate_only=True) as probe:
+            probe.open(filepath)
+            if sheet not in probe.wb.sheetnames:
+                raise ValueError(f"Sheet '{sheet}' not found. Available: {probe.wb.sheetnames}")
+            noop = _is_noop(probe.wb[sheet], cell, value, style, number_format)
+        return {
+            "status": "dry_run",
+            "file": path_str,
+            **_describe(sheet, cell, value, style, number_format),
+            "noop": noop
+        }
+    
+    if out is not None:
+        with ExcelAgent.open_for_write(filepath) as agent:
+            noop = not _apply_if_changed(agent, sheet, cell, value, style, number_format)
+            if noop:
+                with open(filepath, 'rb') as src:
+                    _copy_stream(src, out)
+            else:
+                agent.save_stream(out, no_recalc=no_recalc, copy_unedited=True)
+        return {
+            "status": "success",
+            "file": path_str,
+            **_describe(sheet, cell, value, style, number_format),
+            "fast_patch": False,
+            "noop": noop
+        }
+    
+    # A plain value edit needs no style merge, so patch the sheet XML in
+    # place; anything the patch cannot reproduce exactly goes through openpyxl.
+    # The patch leaves the file alone if the cell already holds the value
+    patched = noop = False
+    if style is None and number_format is None:
+        from excel_agent.core.fast_patch import FastPatchUnsupported, fast_set_cell
+        try:
+            noop = not fast_set_cell(filepath, sheet, cell, value, no_recalc=no_recalc)
+            patched = not noop
+        except FastPatchUnsupported:
+            pass
+    
+    if not (patched or noop):
+        # Idempotent retries are common; don't rewrite the file for them
+        with ExcelAgent.open_for_write(filepath) as agent:
+            noop = not _apply_if_changed(agent, sheet, cell, value, style, number_format)
+            if not noop:
+                agent.save_incremental(no_recalc=no_recalc)
+    
+    return {
+        "status": "success",
+        "file": path_str,
+        **_describe(sheet, cell, value, style, number_format),
+        "fast_patch": patched,
+        "noop": noop
+    }
+
+
+def _copy_stream(src: BinaryIO, dst: BinaryIO) -> None:
+    import shutil
+    
+    shutil.copyfileobj(src, dst)
+    dst.flush()
+
+
+def set_stream_value(
+    source: BinaryIO,
+    sheet: str,
+    cell: str,
+    value: Any,
+    style: Optional[str] = None,
+    number_format: Optional[str] = None,
+    no_recalc: bool = False,
+    dry_run: bool = False,
+    out: Optional[BinaryIO] = None
+) -> Dict[str, Any]:
+    """Set a cell in a workbook read from source (--file -) and write it to out."""
+    from excel_agent.core.excel_agent_core import ExcelAgent
+    
+    if not dry_run and out is None:
+        raise ValueError("--file - requires --stdout-xlsx or --dry-run")
+    
+    if not is_valid_cell_reference(cell):
+        raise ValueError(f"Invalid cell reference: {cell}")
+    
+    with ExcelAgent(validate_only=dry_run) as agent:
+        agent.open_stream(source)
+        if dry_run:
+            if sheet not in agent.wb.sheetnames:
+                raise ValueError(f"Sheet '{sheet}' not found. Available: {agent.wb.sheetnames}")
+            noop = _is_noop(agent.wb[sheet], cell, value, style, number_format)
+        else:
+            _apply(agent, sheet, cell, value, style, number_format)
+            agent.save_stream(out, no_recalc=no_recalc, copy_unedited=True)
+    
+    if dry_run:
+        return {
+            "status": "dry_run",
+            "file": "-",
+            **_describe(sheet, cell, value, style, number_format),
+            "noop": noop
+        }
+    
+    return {
+        "status": "success",
+        "file": "-",
+        **_describe(sheet, cell, value, style, number_format),
+        "fast_patch": False,
+        "noop": False
+    }
+
+
+# ============================================================================
+# BATCH & DAEMON
+# ============================================================================
+
+def _read_edit(request: Dict[str, Any]) -> Tuple[str, str, Any, Optional[str], Optional[str]]:
+    """
+    Unpack a {"op": "set", "sheet", "cell", "value"[, "type", "style",
+    "format"]} request. JSON values are used as-is unless a type is given.
+    """
+    missing = [key for key in ("sheet", "cell", "value") if key not in request]
+    if missing:
+        raise ValueError(f"Missing field(s): {', '.join(missing)}")
+    
+    value = request["value"]
+    if "type" in request:
+        value = parse_value(str(value), request["type"])
+    
+    return request["sheet"], request["cell"], value, request.get("style"), request.get("format")
+
+
+def run_batch(filepath: Path, lines: Iterable[str], no_recalc: bool = False) -> Dict[str, Any]:
+    """
+    Apply JSON-line edits to one workbook with a single open and save.
+    
+    Every line is parsed before the workbook is touched, and nothing is
+    saved unless all edits apply.
+    """
+    if not filepath.exists():
+        raise FileNotFoundError(f"File not found: {filepath}")
+    _check_writable_format(filepath)
+    
+    edits = []
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            op = request.get("op", "set")
+            if op == "flush":
+                # The whole batch is saved once at the end
+                continue
+            if op != "set":
+                raise ValueError(f"Unknown op '{op}'")
+            edits.append(_read_edit(request))
+        except (ValueError, AttributeError) as e:
+            raise ValueError(f"Line {line_no}: {e}") from e
+    
+    from excel_agent.core.excel_agent_core import ExcelAgent
+    
+    with ExcelAgent.open_for_write(filepath) as agent:
+        for edit in edits:
+            _apply(agent, *edit)
+        if edits:
+            agent.save_incremental(no_recalc=no_recalc)
+    
+    cells = [_describe(*edit) for edit in edits]
+    return {
+        "status": "success",
+        "file": str(filepath),
+        "edits": len(cells),
+        "cells": cells
+    }
+
+
+class _WorkbookCache:
+    """Writable workbooks held open between daemon requests, in LRU order."""
+    
+    def __init__(self, max_open: int, flush_every: int, no_recalc: bool = False):
+        self.max_open = max_open
+        self.flush_every = flush_every
+        self.no_recalc = no_recalc
+        self.agents: "OrderedDict[Path, Any]" = OrderedDict()
+        self.pending: Dict[Path, int] = {}
+        self.stamps: Dict[Path, Tuple[int, int]] = {}
+    
+    @staticmethod
+    def _stamp(key: Path) -> Tuple[int, int]:
+        st = key.stat()
+        return st.st_mtime_ns, st.st_size
+    
+    def get(self, filepath: Path):
+        """
+        Return the open agent for filepath, opening (and locking) it if needed.
         
-        # Verify sheet exists
-        if sheet not in agent.wb.sheetnames:
-            raise ValueError(f"Sheet '{sheet}' not found. Available: {agent.wb.sheetnames}")
+        A workbook rewritten on disk by someone else since it was opened or
+        last saved is reopened. Its unsaved edits cannot be merged, so they
+        are discarded and reported as an error.
+        """
+        from excel_agent.core.excel_agent_core import ExcelAgent
         
-        # Set value
-        agent.set_cell_value(
-            sheet=sheet,
-            cell=cell,
-            value=value,
-            style=style,
-            number_format=number_format
-        )
+        key = filepath.resolve()
+        if key in self.agents:
+            if self._stamp(key) == self.stamps[key]:
+                self.agents.move_to_end(key)
+                return key, self.agents[key]
+            lost = self.pending.get(key, 0)
+            self.agents.pop(key).close()
+            self.pending.pop(key, None)
+            self.stamps.pop(key, None)
+            if lost:
+                raise ValidationError(
+                    f"{key.name} changed on disk; discarded {lost} unsaved edit(s)"
+                )
+        
+        _check_writable_format(key)
+        agent = ExcelAgent.open_for_write(key)
+        self.agents[key] = agent
+        self.pending[key] = 0
+        self.stamps[key] = self._stamp(key)
+        
+        while len(self.agents) > self.max_open:
+            self.close(next(iter(self.agents)))
         
-        agent.save()
+        return key, agent
+    
+    def edited(self, key: Path) -> bool:
+        """Count an applied edit; saves once flush_every edits are pending."""
+        self.pending[key] += 1
+        if self.pending[key] >= self.flush_every:
+            self.flush(key)
+            return True
+        return False
+    
+    def flush(self, key: Optional[Path] = None) -> List[str]:
+        """Save one workbook, or every workbook with pending edits."""
+        keys = [key] if key is not None else list(self.agents)
+        saved = []
+        for k in keys:
+            if self.pending.get(k):
+                self.agents[k].save_incremental(no_recalc=self.no_recalc)
+                self.pending[k] = 0
+                self.stamps[k] = self._stamp(k)
+                saved.append(str(k))
+        return saved
+    
+    def close(self, key: Path) -> None:
+        """Save pending edits, then close the workbook and release its lock."""
+        try:
+            self.flush(key)
+        finally:
+            self.agents.pop(key).close()
+            self.pending.pop(key, None)
+            self.stamps.pop(key, None)
+    
+    def close_all(self) -> None:
+        for key in list(self.agents):
+            self.close(key)
+
+
+def _daemon_request(cache: _WorkbookCache, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle one daemon request and build its response."""
+    op = request.get("op", "set")
+    
+    if op == "set":
+        if "file" not in request:
+            raise ValueError("Missing field(s): file")
+        sheet, cell, value, style, number_format = _read_edit(request)
+        key, agent = cache.get(Path(request["file"]))
+        _apply(agent, sheet, cell, value, style, number_format)
+        saved = cache.edited(key)
+        return {
+            "status": "success",
+            "file": str(key),
+            **_describe(sheet, cell, value, style, number_format),
+            "saved": saved
+        }
+    
+    if op == "flush":
+        key = Path(request["file"]).resolve() if "file" in request else None
+        if key is not None and key not in cache.agents:
+            return {"status": "success", "saved": []}
+        return {"status": "success", "saved": cache.flush(key)}
+    
+    if op == "shutdown":
+        return {"status": "success", "shutdown": True}
+    
+    raise ValueError(f"Unknown op '{op}'")
+
+
+def serve_daemon(
+    socket_path: Path,
+    flush_every: int = DEFAULT_FLUSH_EVERY,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    no_recalc: bool = False
+) -> Dict[str, Any]:
+    """
+    Serve JSON-line requests on a Unix socket until a shutdown op arrives.
+    
+    Up to MAX_OPEN_WORKBOOKS workbooks stay open (and locked) between
+    requests. Edits are saved every flush_every ops per workbook, on a
+    flush op, on eviction, and when no client connects for idle_timeout
+    seconds, which also closes every workbook.
+    A workbook changed on disk by another writer is reopened before the
+    next edit to it.
+    
+    Connections are served one at a time on a single thread: a second
+    client blocks until the first disconnects. Refuses to start while
+    another daemon is serving socket_path.
+    """
+    import socket
+    import socketserver
+    
+    if not hasattr(socketserver, "UnixStreamServer"):
+        raise OSError("Daemon mode needs Unix domain sockets")
+    
+    if flush_every < 1:
+        raise ValueError("--flush-every must be at least 1")
+    
+    cache = _WorkbookCache(MAX_OPEN_WORKBOOKS, flush_every, no_recalc)
+    state = {"requests": 0, "running": True}
+    
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                state["requests"] += 1
+                try:
+                    request = json.loads(line)
+                    response = _daemon_request(cache, request)
+                except Exception as e:
+                    response = {
+                        "status": "error",
+                        "error": str(e),
+                        "error_type": type(e).__name__
+                    }
+                self.wfile.write(_encode_json(response) + b"\n")
+                if response.get("shutdown"):
+                    state["running"] = False
+                    return
+    
+    class Server(socketserver.UnixStreamServer):
+        timeout = idle_timeout
+        
+        def handle_timeout(self):
+            cache.close_all()
+    
+    # Replace a socket left behind by a daemon that did not exit cleanly,
+    # never one a live daemon (and its unsaved edits) still answers on
+    if socket_path.is_socket():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            socket_path.unlink(missing_ok=True)
+        else:
+            raise OSError(f"A daemon is already serving {socket_path}")
+        finally:
+            probe.close()
+    
+    try:
+        with Server(str(socket_path), Handler) as server:
+            while state["running"]:
+                server.handle_request()
+    finally:
+        try:
+            cache.close_all()
+        finally:
+            if socket_path.is_socket():
+                os.unlink(socket_path)
     
     return {
         "status": "success",
-        "file": str(filepath),
-        "sheet": sheet,
-        "cell": cell,
-        "value": str(value),
-        "type": type(value).__name__,
-        "style": style,
-        "number_format": number_format
+        "socket": str(socket_path),
+        "requests": state["requests"]
     }
 
 
@@ -113,38 +636,45 @@ Examples:
   
   # Set with custom format
   uv python excel_set_value.py --file model.xlsx --sheet Data --cell C3 --value "0.15" --type number --format "0.0%" --json
+  
+  # Many edits, one open and one save (JSON lines on stdin)
+  echo '{"sheet": "Data", "cell": "A1", "value": 100}' | uv python excel_set_value.py --file model.xlsx --batch - --json
+  
+  # Keep workbooks open across calls; send the same JSON lines plus "file"
+  uv python excel_set_value.py --daemon --socket /tmp/excel-agent.sock
+
+Batch/daemon ops (one JSON object per line):
+  {"op": "set", "sheet": ..., "cell": ..., "value": ..., "type"?, "style"?, "format"?}
+  {"op": "flush"}      save pending edits now
+  {"op": "shutdown"}   daemon only: save, close and exit
         """
     )
     
     parser.add_argument(
         '--file',
-        required=True,
         type=Path,
-        help='Excel file path'
+        help="Excel file path ('-' to read the workbook from stdin)"
     )
     
     parser.add_argument(
         '--sheet',
-        required=True,
         help='Sheet name'
     )
     
     parser.add_argument(
         '--cell',
-        required=True,
         help='Cell reference (e.g., A1, B10)'
     )
     
     parser.add_argument(
         '--value',
-        required=True,
         help='Value to set'
     )
     
     parser.add_argument(
         '--type',
         default='auto',
-        choices=['auto', 'string', 'number', 'integer', 'date'],
+        choices=list(_PARSERS),
         help='Value type (default: auto)'
     )
     
@@ -158,6 +688,57 @@ Examples:
         help='Number format string'
     )
     
+    parser.add_argument(
+        '--no-recalc',
+        action='store_true',
+        help='Set manual calculation and drop calcChain so Excel skips a full recalc on open'
+    )
+    
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Check the edit without writing anything'
+    )
+    
+    parser.add_argument(
+        '--stdout-xlsx',
+        action='store_true',
+        help="Write the edited workbook to stdout instead of --file (report goes to stderr)"
+    )
+    
+    parser.add_argument(
+        '--batch',
+        metavar='PATH',
+        help="Apply JSON-line edits from PATH ('-' for stdin) with one save"
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Serve edits on a Unix socket, one client at a time, keeping workbooks open'
+    )
+    
+    parser.add_argument(
+        '--socket',
+        type=Path,
+        default=Path(DEFAULT_SOCKET),
+        help=f'Daemon socket path (default: {DEFAULT_SOCKET})'
+    )
+    
+    parser.add_argument(
+        '--flush-every',
+        type=int,
+        default=DEFAULT_FLUSH_EVERY,
+        help=f'Daemon: save a workbook after this many edits (default: {DEFAULT_FLUSH_EVERY})'
+    )
+    
+    parser.add_argument(
+        '--idle-timeout',
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help=f'Daemon: save and close workbooks after this many idle seconds (default: {DEFAULT_IDLE_TIMEOUT:g})'
+    )
+    
     parser.add_argument(
         '--json',
         action='store_true',
@@ -166,24 +747,89 @@ Examples:
     
     args = parser.parse_args()
     
+    modes = [name for name in ("daemon", "batch") if getattr(args, name)]
+    if len(modes) > 1:
+        parser.error(" and ".join(f"--{m.replace('_', '-')}" for m in modes) + " are mutually exclusive")
+    if args.batch and args.file is None:
+        parser.error(f"--{modes[0].replace('_', '-')} requires --file")
+    if not modes:
+        missing = [
+            f"--{name}" for name in ("file", "sheet", "cell", "value")
+            if getattr(args, name) is None
+        ]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+    elif args.dry_run or args.stdout_xlsx:
+        parser.error(f"--{modes[0].replace('_', '-')} does not support --dry-run or --stdout-xlsx")
+    if args.dry_run and args.stdout_xlsx:
+        parser.error("--dry-run and --stdout-xlsx are mutually exclusive")
+    
+    # stdout carries the workbook bytes, so reports go to stderr
+    report = sys.stderr if args.stdout_xlsx else sys.stdout
+    
     try:
+        if args.daemon:
+            result = serve_daemon(args.socket, args.flush_every, args.idle_timeout, args.no_recalc)
+            
+            if args.json:
+                _print_json(result)
+            else:
+                print(f"✅ Daemon on {args.socket} stopped after {result['requests']} request(s)")
+            
+            sys.exit(0)
+        
+        if args.batch:
+            if args.batch == '-':
+                result = run_batch(args.file, sys.stdin, args.no_recalc)
+            else:
+                with open(args.batch, encoding='utf-8') as f:
+                    result = run_batch(args.file, f, args.no_recalc)
+            
+            if args.json:
+                _print_json(result)
+            else:
+                print(f"✅ Applied {result['edits']} edit(s) to {args.file}")
+            
+            sys.exit(0)
+        
         # Parse value
         parsed_value = parse_value(args.value, args.type)
         
         # Set value
-        result = set_cell_value(
-            filepath=args.file,
-            sheet=args.sheet,
-            cell=args.cell,
-            value=parsed_value,
-            style=args.style,
-            number_format=args.format
-        )
+        out = sys.stdout.buffer if args.stdout_xlsx else None
+        if str(args.file) == '-':
+            import io
+            
+            result = set_stream_value(
+                source=io.BytesIO(sys.stdin.buffer.read()),
+                sheet=args.sheet,
+                cell=args.cell,
+                value=parsed_value,
+                style=args.style,
+                number_format=args.format,
+                no_recalc=args.no_recalc,
+                dry_run=args.dry_run,
+                out=out
+            )
+        else:
+            result = set_cell_value(
+                filepath=args.file,
+                sheet=args.sheet,
+                cell=args.cell,
+                value=parsed_value,
+                style=args.style,
+                number_format=args.format,
+                no_recalc=args.no_recalc,
+                dry_run=args.dry_run,
+                out=out
+            )
         
         if args.json:
-            print(json.dumps(result, indent=2))
+            _print_json(result, report)
+        elif args.dry_run:
+            print(f"✅ Would set {args.sheet}!{args.cell} = {parsed_value}", file=report)
         else:
-            print(f"✅ Set {args.sheet}!{args.cell} = {parsed_value}")
+            print(f"✅ Set {args.sheet}!{args.cell} = {parsed_value}", file=report)
         
         sys.exit(0)
         
@@ -195,7 +841,7 @@ Examples:
         }
         
         if args.json:
-            print(json.dumps(error_result, indent=2))
+            _print_json(error_result, report)
         else:
             print(f"❌ Error: {e}", file=sys.stderr)
         
@@ -17,9 +17,10 @@ import argparse
 from pathlib import Path
 from typing import Dict, Any
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.excel_agent_core import validate_workbook, ValidationReport
+from excel_agent.core.excel_agent_core import validate_workbook, ValidationReport
 
 
 def validate_formulas(